@@ -5,22 +5,27 @@ from PySide6.QtWidgets import QApplication, QMainWindow, QDialog, QToolBar, QSiz
 from PySide6.QtWidgets import QWidget, QGridLayout, QFileDialog
 from PySide6.QtWidgets import QPushButton, QLabel, QLineEdit, QComboBox, QFrame
 from inspect import currentframe, getframeinfo
-from random import randint, shuffle
+from random import Random
 
+import argparse
 import datetime
 import functools
 import gzip
-import itertools
 import json
 import math
 import multiprocessing
-import operator
 import os
+import queue
 import sys
+import threading
 import time
 import webbrowser
+import zlib
 
 import dark_theme
+import mine_engine
+from mine_engine import BOARD_MAGIC, GZIP_MAGIC, MIN_WIDTH, MAX_WIDTH, MIN_HEIGHT, MAX_HEIGHT, MINE_SEED_MAX
+from mine_engine import SYMBOL_BLANK, SYMBOL_MINE, SYMBOL_FLAG, SYMBOL_WRONG_FLAG, SYMBOL_UNKNOWN
 
 try:
     from ctypes import windll
@@ -58,20 +63,6 @@ DIFFICULTY_PRESET = [
     (0.24, "Brutal", ),
 ]
 
-SAFETY_LEVEL_DEFAULT = 1
-
-MIN_WIDTH = 3
-MAX_WIDTH = 1000
-
-MIN_HEIGHT = 3
-MAX_HEIGHT = 1000
-
-SYMBOL_BLANK = " "
-SYMBOL_MINE = "X"
-SYMBOL_FLAG = "!"
-SYMBOL_WRONG_FLAG = "#"
-SYMBOL_UNKNOWN = "?"
-
 COLOR_DICT = {
     SYMBOL_BLANK: "white",
     SYMBOL_MINE: "#ff0000",
@@ -90,501 +81,37 @@ COLOR_DICT = {
 
 BUTTON_SIZE_DEFAULT = 20
 
+# seconds the looper pauses after a game is finished and after a new map is ready
+LOOPER_PACING_VISUAL = 1
 
-class Land(object):
-    mine_field = None
-
-    x = 0
-    y = 0
-    id = 0
-    cover = SYMBOL_BLANK
-    content = SYMBOL_BLANK
-    have_mine = False
-    adjacent_mine_count = 0
-    checked = False
-    focus = False
-    wrong_flag = False
-
-    ui = None
-
-    def __init__(self, mine_field, x, y):
-        self.mine_field = mine_field
-        self.x, self.y = x, y
-        self.id = x + self.mine_field.field_width * y
-
-    def left_click(self, chain=False):
-        field_width = self.mine_field.field_width
-        field_height = self.mine_field.field_height
-
-        if self.mine_field.game.terminated or not self.mine_field.game.terminated and self.cover in [
-            SYMBOL_FLAG,
-            SYMBOL_UNKNOWN,
-        ]:
-            # prevent changing check status
-            self.ui.setChecked(self.checked)
-            return
-
-        if not chain:
-            # print(f"Click ({self.x}, {self.y})")
-            if len([x for x in self.mine_field.land_list if x.have_mine is True]) == 0:
-                if self.mine_field.game.safety_level >= 1:
-                    # first click always safe
-                    self.mine_field.generate_mine(self.x, self.y)
-                else:
-                    self.mine_field.generate_mine()
-
-        self.checked = True
-
-        # check if click on mine
-        self.mine_field.check_end_game(self.x, self.y)
-
-        if not self.mine_field.game.terminated:
-            flag_num = 0
-            for x, y in itertools.product([-1, 0, 1], [-1, 0, 1]):
-                if x == 0 and y == 0:
-                    continue
-                if 0 <= self.x + x < field_width and 0 <= self.y + y < field_height:
-                    land = self.mine_field.land_list[(self.x + x) + field_width * (self.y + y)]
-                    if not land.checked and land.cover == SYMBOL_FLAG:
-                        flag_num += 1
-            if flag_num >= self.adjacent_mine_count:
-                for x, y in itertools.product([-1, 0, 1], [-1, 0, 1]):
-                    if x == 0 and y == 0:
-                        continue
-                    if 0 <= self.x + x < field_width and 0 <= self.y + y < field_height:
-                        land = self.mine_field.land_list[(self.x + x) + field_width * (self.y + y)]
-                        if not land.checked and land.cover not in [
-                            SYMBOL_FLAG,
-                            SYMBOL_UNKNOWN,
-                        ]:
-                            land.left_click(chain=True)
-
-        if not chain:
-            if self.mine_field.game.safety_level >= 2:
-                for _land in self.mine_field.land_list:
-                    if _land.checked is False and _land.content == SYMBOL_BLANK:
-                        _land.left_click(chain=True)
-
-            self.focus = True
-            if self.ui is not None:
-                self.ui.update_display()
-
-            # check if chain click on mine
-            self.mine_field.check_end_game(self.x, self.y)
-
-            for _land in self.mine_field.land_list:
-                if _land == self:
-                    continue
-                _land.focus = False
-                if _land.ui is not None:
-                    _land.ui.update_display()
-
-            if self.mine_field.game.ui is not None:
-                self.mine_field.game.ui.update_title()
-                if not self.mine_field.game.terminated:
-                    self.mine_field.game.ui.set_message(
-                        f"{self.mine_field.mine_count - self.mine_field.marked_land_count()} mines left")
-
-    def auto_click(self):
-        # print(f"Auto Click")
-        self.left_click()
-
-    def right_click(self):
-        if not self.mine_field.game.terminated:
-            # print(f"Mark  ({self.x}, {self.y})")
-            if not self.checked:
-                if self.cover == SYMBOL_BLANK:
-                    self.cover = SYMBOL_FLAG
-                elif self.cover == SYMBOL_FLAG:
-                    self.cover = SYMBOL_UNKNOWN
-                elif self.cover == SYMBOL_UNKNOWN:
-                    self.cover = SYMBOL_BLANK
-                else:
-                    self.cover = SYMBOL_FLAG
-            self.focus = True
-            if self.ui is not None:
-                self.ui.update_display()
-            if self.mine_field.game.ui is not None:
-                self.mine_field.game.ui.update_title()
-                self.mine_field.game.ui.set_message(
-                    f"{self.mine_field.mine_count - self.mine_field.marked_land_count()} mines left")
-
-            for _land in self.mine_field.land_list:
-                if _land == self:
-                    continue
-                _land.focus = False
-                if _land.ui is not None:
-                    _land.ui.update_display()
-
-    def auto_mark(self):
-        # print(f"Auto Mark")
-        while not self.mine_field.game.terminated and self.cover != SYMBOL_FLAG:
-            self.right_click()
-
-    def control_left_click(self):
-        if not self.mine_field.game.edit_mode or self.mine_field.game.terminated:
-            self.ui.setChecked(self.checked)
-            return
-
-        if len([x for x in self.mine_field.land_list if x.have_mine is True]) == 0:
-            self.mine_field.generate_mine()
-
-        if self.checked:
-            self.checked = False
-        if not self.have_mine:
-            self.have_mine = True
-            self.content = SYMBOL_MINE
-            self.mine_field.mine_count += 1
-        else:
-            self.have_mine = False
-            if self.adjacent_mine_count == 0:
-                self.content = SYMBOL_BLANK
-            else:
-                self.content = f"{self.adjacent_mine_count}"
-            self.mine_field.mine_count -= 1
-
-        if self.ui is not None:
-            self.ui.setChecked(self.checked)
-            self.ui.update_display()
-
-        field_width = self.mine_field.field_width
-        field_height = self.mine_field.field_height
-        for x, y in itertools.product([-1, 0, 1], [-1, 0, 1]):
-            if x == 0 and y == 0:
-                continue
-            if 0 <= (self.x + x) < field_width and 0 <= (self.y + y) < field_height:
-                adj_land = self.mine_field.land_list[(self.x + x) + field_width * (self.y + y)]
-                if self.have_mine:
-                    adj_land.adjacent_mine_count += 1
-                else:
-                    adj_land.adjacent_mine_count -= 1
-                if not adj_land.have_mine:
-                    if adj_land.adjacent_mine_count == 0:
-                        adj_land.content = SYMBOL_BLANK
-                    else:
-                        adj_land.content = f"{adj_land.adjacent_mine_count}"
-                if adj_land.ui is not None:
-                    adj_land.ui.update_display()
-        if self.mine_field.game.ui is not None:
-            self.mine_field.game.ui.update_title()
-
-    def control_right_click(self):
-        if not self.mine_field.game.edit_mode or self.mine_field.game.terminated:
-            return
-
-        if self.checked:
-            self.checked = False
-
-        if self.ui is not None:
-            self.ui.setChecked(self.checked)
-            self.ui.update_display()
-
-        if self.mine_field.game.ui is not None:
-            self.mine_field.game.ui.update_title()
-
-    def to_string(self):
-        return f"{self.id} ({self.x}, {self.y})"
-
-    def save(self):
-        res = dict()
-        for key in [
-            "x",
-            "y",
-            "id",
-            "cover",
-            "content",
-            "have_mine",
-            "adjacent_mine_count",
-            "checked",
-            "focus",
-        ]:
-            res[key] = getattr(self, key)
-        return res
-
-    def load(self, data):
-        for key in data:
-            setattr(self, key, data[key])
-
-    def ui_init(self, parent):
-        self.ui = LandUI(self, parent)
-
-    def ui_setup(self):
-        self.ui.update_display()
-        self.ui.update_tooltip()
-
-
-class MineField(object):
-    game = None
-
-    field_width = 0
-    field_height = 0
-    mine_count = 0
-
-    land_list = None
-    land_list_copy = None
-
-    ui = None
-
-    def __init__(self, game):
-        self.game = game
-        self.init_mine_field()
-
-    def init_mine_field(self, keep_ui=False):
-        self.field_width = min(max(MIN_WIDTH, self.field_width), MAX_WIDTH)
-        self.field_height = min(max(MIN_HEIGHT, self.field_height), MAX_HEIGHT)
-        self.mine_count = min(max(1, self.mine_count), (self.field_width - 1) * (self.field_height - 1))
-
-        if self.land_list_copy is not None:
-            self.land_list_copy.clear()
-        if self.land_list is not None:
-            if keep_ui:
-                self.land_list_copy = self.land_list[:]
-            self.land_list.clear()
-        self.land_list = list()
-        for y in range(self.field_height):
-            for x in range(self.field_width):
-                land = Land(self, x, y)
-                land.cover = SYMBOL_BLANK
-                self.land_list.append(land)
-
-    def reset_mine_field(self):
-        for land in self.land_list:
-            land.cover = SYMBOL_BLANK
-            land.checked = False
-            land.focus = False
-            land.wrong_flag = False
-            if land.ui is not None:
-                land.ui.update_display()
-
-    def generate_mine(self, safe_x=-9, safe_y=-9):
-        for x in range(self.field_width):
-            for y in range(self.field_height):
-                self.land_list[x + self.field_width * y].have_mine = False
-                self.land_list[x + self.field_width * y].adjacent_mine_count = 0
-                self.land_list[x + self.field_width * y].checked = False
-                self.land_list[x + self.field_width * y].content = SYMBOL_BLANK
-
-                # self.land_list[x + self.field_width * y].ui.update_display()
-
-        for _ in range(self.mine_count):
-            x, y = -1, -1
-            while x < 0 or y < 0 or self.land_list[x + self.field_width * y].have_mine:
-                x = randint(0, self.field_width - 1)
-                y = randint(0, self.field_height - 1)
-                if abs(x - safe_x) <= 1 and abs(y - safe_y) <= 1:
-                    x, y = -1, -1
-            self.land_list[x + self.field_width * y].have_mine = True
-            for _x, _y in itertools.product([-1, 0, 1], [-1, 0, 1]):
-                if _x == 0 and _y == 0:
-                    continue
-                if 0 <= (x + _x) < self.field_width and 0 <= (y + _y) < self.field_height:
-                    self.land_list[(x + _x) + self.field_width * (y + _y)].adjacent_mine_count += 1
-
-        for y in range(self.field_height):
-            for x in range(self.field_width):
-                land = self.land_list[x + self.field_width * y]
-                if land.have_mine:
-                    land.content = SYMBOL_MINE
-                elif land.adjacent_mine_count == 0:
-                    land.content = SYMBOL_BLANK
-                else:
-                    land.content = f"{land.adjacent_mine_count}"
-
-        self.game.start_time = datetime.datetime.now()
-
-    def field_size(self):
-        return {
-            "field_width": self.field_width,
-            "field_height": self.field_height,
-            "mine_count": self.mine_count,
-        }
-
-    def land(self, _id=None, x=None, y=None):
-        if type(_id) is int:
-            return self.land_list[_id]
-        elif type(x) is int and type(y) is int:
-            x = max(0, min(x, self.field_width - 1))
-            y = max(0, min(y, self.field_height - 1))
-            return self.land_list[x + y * self.field_width]
-        else:
-            return None
-
-    def land_is_neighbor(self, a_id, b_id):
-        a, b = self.land(a_id), self.land(b_id)
-        for _x, _y in itertools.product([-1, 0, 1], [-1, 0, 1]):
-            if a.x + _x == b.x and a.y + _y == b.y:
-                return True
-        return False
-
-    def land_get_neighbor(self, _id):
-        land = self.land(_id)
-        res_id = list()
-        for _x, _y in itertools.product([-1, 0, 1], [-1, 0, 1]):
-            if _x == 0 and _y == 0:
-                continue
-            if 0 <= (land.x + _x) < self.field_width and 0 <= (land.y + _y) < self.field_height:
-                res_id.append(self.land(x=land.x + _x, y=land.y + _y).id)
-        return res_id
-
-    def get_focus(self):
-        for land in self.land_list:
-            if land.focus is True:
-                return land
-        return None
-
-    def set_focus(self, _id):
-        land = self.get_focus()
-        land.focus = False
-        for land in self.land_list:
-            if land.id == _id:
-                land.focus = True
-            if land.ui is not None:
-                land.ui.update_display()
-
-    def revealed_land_count(self):
-        return len([x for x in self.land_list if x.checked])
-
-    def marked_land_count(self):
-        return len([x for x in self.land_list if not x.checked and x.cover == SYMBOL_FLAG])
-
-    def cover_land_count(self):
-        return self.field_width * self.field_height - self.revealed_land_count() - self.marked_land_count()
-
-    def cover_mine_count(self):
-        return self.mine_count - self.marked_land_count()
-
-    def row_mark_count(self, _id):
-        land = self.land(_id)
-        count = 0
-        for x in range(0, self.field_width):
-            if x == land.x:
-                continue
-            if self.land_list[x + self.field_width * land.y].cover == SYMBOL_FLAG:
-                count += 1
-        return count
-
-    def col_mark_count(self, _id):
-        land = self.land(_id)
-        count = 0
-        for y in range(0, self.field_height):
-            if y == land.y:
-                continue
-            if self.land_list[land.x + self.field_width * y].cover == SYMBOL_FLAG:
-                count += 1
-        return count
-
-    def range_mark_count(self, _id, distance=1):
-        land = self.land(_id)
-        count = 0
-        total = 0
-        range_array = range(-distance, distance + 1)
-        for _x, _y in itertools.product(range_array, range_array):
-            if _x == 0 and _y == 0:
-                continue
-            if 0 <= (land.x + _x) < self.field_width and 0 <= (land.y + _y) < self.field_height:
-                total += 1
-                if self.land_list[land.x + _x + self.field_width * (land.y + _y)].cover == SYMBOL_FLAG:
-                    count += 1
-        return int(count / total * 8)
-
-    def check_end_game(self, x, y):
-        if self.land_list[x + self.field_width * y].have_mine:
-            self.game.end_time = datetime.datetime.now()
-            self.game.terminated = True
-            self.game.result = "LOSE"
-            if self.game.ui is not None:
-                self.game.ui.set_message("YOU LOSE")
-            for land in self.land_list:
-                if land.have_mine:
-                    if land.cover != SYMBOL_FLAG:
-                        land.cover = SYMBOL_MINE
-                        if land.ui is not None:
-                            land.ui.update_display()
-                else:
-                    if land.cover == SYMBOL_FLAG:
-                        land.wrong_flag = True
-                        if land.ui is not None:
-                            land.ui.update_display()
-        elif self.revealed_land_count() == self.field_width * self.field_height - self.mine_count:
-            self.game.end_time = datetime.datetime.now()
-            self.game.terminated = True
-            self.game.result = "WIN"
-            if self.game.ui is not None:
-                self.game.ui.set_message("YOU WIN")
-            for y in range(self.field_height):
-                for x in range(self.field_width):
-                    if self.land_list[x + self.field_width * y].have_mine:
-                        self.land_list[x + self.field_width * y].cover = SYMBOL_FLAG
-                        # self.land_list[x + self.field_width * y].ui.update_display()
-
-    def save(self):
-        res = dict()
-        for key in [
-            "field_width",
-            "field_height",
-            "mine_count",
-        ]:
-            res[key] = getattr(self, key)
-        res["land_list"] = list()
-        for land in self.land_list:
-            res["land_list"].append(land.save())
-        return res
-
-    def load(self, data, data_only=False):
-        for key in [
-            "field_width",
-            "field_height",
-            "mine_count",
-        ]:
-            setattr(self, key, data[key])
-        self.init_mine_field(keep_ui=data_only)
-        for i, land in enumerate(data["land_list"]):
-            self.land_list[i].load(land)
 
+class MineField(mine_engine.MineField):
+    # widgets over the planes of mine_engine.MineField
     def ui_init(self, parent):
         self.ui = MineFieldUI(parent)
 
     def ui_setup(self):
-        self.ui.init_grid()
+        self.ui.init_grid(self.field_width, self.field_height)
         for land in self.land_list:
             if land.ui is None:
-                land.ui_init(self.ui)
+                land.ui = LandUI(land, self.ui)
                 self.ui.add_land(land.ui, land.y, land.x)
-            land.ui_setup()
+            land.ui.update_size()
+            land.ui.update_display()
+            land.ui.update_tooltip()
 
         self.game.ui.setFixedWidth(20 + self.field_width * self.game.ui.button_size)
         self.game.ui.setFixedHeight(100 + self.field_height * self.game.ui.button_size)
 
 
-class Game(object):
-    id = -1
-
-    terminated = False
-    start_time = None
-    end_time = None
-    result = None
-    safety_level = SAFETY_LEVEL_DEFAULT
-    edit_mode = False
-
-    mine_field = None
-
-    bot = None
+class Game(mine_engine.Game):
     bot_start_time = None
     bot_looper = None
     bot_pool = None
-    bot_stat = None
-
-    global_stat = None
-
-    ui = None
 
     def __init__(self, _id, global_stat):
-        self.id = _id
-        self.global_stat = global_stat
-        
-        self.mine_field = MineField(self)
+        super().__init__(_id, global_stat)
 
-        self.bot = Bot(self)
         self.bot.result.click.connect(self.bot_click)
         self.bot.result.random_click.connect(self.bot_random_click)
         self.bot.result.mark.connect(self.bot_mark)
@@ -594,24 +121,19 @@ class Game(object):
         self.bot_looper = BotLooper()
         self.bot_looper.status.init_map.connect(self.new_game_setup)
         self.bot_looper.status.start_bot.connect(self.start_bot)
-        self.bot_looper.status.looping_exited.connect(self.looper_exited)
 
         self.bot_pool = QThreadPool()
-        self.bot_pool.setMaxThreadCount(20)
+        # the bot and the looper
+        self.bot_pool.setMaxThreadCount(2)
 
-        self.bot_stat = BotStat(self)
+    def create_mine_field(self):
+        return MineField(self)
 
-    def new_game_setup(self, field_width=0, field_height=0, mine_count=0):
-        if field_width > 0:
-            self.mine_field.field_width = field_width
-        if field_height > 0:
-            self.mine_field.field_height = field_height
-        if mine_count > 0:
-            self.mine_field.mine_count = mine_count
-
-        self.mine_field.init_mine_field()
+    def create_bot(self):
+        return Bot(self)
 
-        self.reset_status()
+    def new_game_setup(self, field_width=0, field_height=0, mine_count=0):
+        super().new_game_setup(field_width, field_height, mine_count)
 
         if self.ui is not None:
             self.ui_setup()
@@ -621,53 +143,32 @@ class Game(object):
         if self.bot_looper is not None and self.bot_looper.looping:
             self.bot_looper.status.map_ready.emit()  # --> bot_looper
 
-    def reset_status(self):
-        self.terminated = False
-        self.start_time = None
-        self.end_time = None
-        self.result = None
+    def default_save_extension(self):
+        return "png"
 
-    @staticmethod
-    def default_save_folder():
-        now = datetime.datetime.now()
-        folder_name = f"screenshot/{now.strftime("%Y_%m_%d_%H")}"
-        os.makedirs(folder_name, exist_ok=True)
-        return folder_name
-
-    def default_save_name(self):
-        now = datetime.datetime.now()
-        land_count = len(self.mine_field.land_list)
-        num_len = len(str(land_count))
-        unsolved_count = land_count \
-            - self.mine_field.revealed_land_count() \
-            - self.mine_field.marked_land_count()
-        return f"{now.strftime("%Y_%m_%d_%H_%M_%S_%f")}" \
-               f"___{unsolved_count:0{num_len}}_{land_count}"
-
-    def save(self, file_path, data=None):
-        if self.ui is not None:
-            pixmap = self.ui.take_screenshot()
-            pixmap.save(file_path, "png")
-        else:
-            with open(file_path, "wb") as f:
-                f.write(b"IEND\xAE\x42\x60\x82")
-        if data is None:
-            data = self.mine_field.save()
-        with open(file_path, "ab") as f:
-            f.write(gzip.compress(json.dumps(data, separators=(",", ":", )).encode("utf-8")))
+    def save_image(self, file_path):
+        pixmap = self.ui.take_screenshot()
+        pixmap.save(file_path, "png")
 
     def load(self, file_path):
         with open(file_path, "rb") as f:
             data = f.read()
-            iend_index = data.rfind(b'IEND') + len(b'IEND') + 4
+            board_index = 0
+            if not data.startswith(GZIP_MAGIC):
+                # the board follows the png image, after the IEND chunk and its crc
+                board_index = data.rfind(b'IEND') + len(b'IEND') + 4
             try:
-                json_data = json.loads(gzip.decompress(data[iend_index:]))
-                self.mine_field.load(json_data)
+                board_data = gzip.decompress(data[board_index:])
+                if not board_data.startswith(BOARD_MAGIC):
+                    # saved by older versions
+                    board_data = json.loads(board_data)
+                self.mine_field.load(board_data)
                 self.reset_status()
                 self.mine_field.ui_setup()
                 self.ui.update_title()
                 self.ui.set_message(f"Load from {file_path.split("/")[-1]}")
-            except gzip.BadGzipFile:
+            except (gzip.BadGzipFile, EOFError, zlib.error, ValueError, KeyError, ):
+                # not a board, or a damaged one
                 pass
 
     def start_bot(self, step=-1, guess=None):
@@ -683,7 +184,7 @@ class Game(object):
         land.auto_click()
         if self.bot.auto_solving:
             self.bot_stat.record_click()
-            if self.ui is not None and self.ui.statistic_dialog is not None:
+            if self.ui.statistic_dialog is not None:
                 self.ui.statistic_dialog.refresh(self.bot_stat.record_list)
         self.bot.result.game_update_completed.emit()  # --> bot
 
@@ -691,7 +192,7 @@ class Game(object):
         land.auto_click()
         if self.bot.auto_solving:
             self.bot_stat.record_random_click()
-            if self.ui is not None and self.ui.statistic_dialog is not None:
+            if self.ui.statistic_dialog is not None:
                 self.ui.statistic_dialog.refresh(self.bot_stat.record_list)
         self.bot.result.game_update_completed.emit()  # --> bot
 
@@ -699,53 +200,39 @@ class Game(object):
         land.auto_mark()
         if self.bot.auto_solving:
             self.bot_stat.record_mark()
-            if self.ui is not None and self.ui.statistic_dialog is not None:
+            if self.ui.statistic_dialog is not None:
                 self.ui.statistic_dialog.refresh(self.bot_stat.record_list)
         self.bot.result.game_update_completed.emit()  # --> bot
 
-    @staticmethod
-    def bot_custom_cover_ui(land, custom_cover, custom_color):
+    def bot_custom_cover_ui(self, land, custom_cover, custom_color):
         land.ui.update_display(custom_cover=custom_cover, custom_color=custom_color)
+        self.mine_field.mark_decorated(land.id)
 
     def bot_finished(self):  # <-- bot
         # self.write_log(f"bot_finish: {self.result}")
-        self.bot_stat.record_game_result(self.result)
-        file_path = None
-        if self.terminated and self.result == "LOSE":
-            data_after_solve = self.mine_field.save()
-            _id = self.mine_field.get_focus().id
-
-            self.mine_field.load(self.bot.data_before_solve, data_only=True)
-            self.mine_field.set_focus(_id)
-            file_path = f"{self.default_save_folder()}/{self.default_save_name()}.png"
-            self.save(file_path)
-
-            if self.mine_field.ui is not None:
-                self.mine_field.load(data_after_solve)
-                self.mine_field.ui_setup()
-        if self.ui is not None and self.ui.statistic_dialog is not None:
+        self.record_bot_result()
+        if self.ui.statistic_dialog is not None:
             self.ui.statistic_dialog.refresh(self.bot_stat.record_list)
-        else:
-            self.bot_stat.to_global_stat(file_path)
 
         self.bot_looper.status.bot_finished.emit()  # --> bot_looper
 
-    def start_looper(self, loop_times=-1):
+    def start_looper(self, loop_times=-1, pacing=LOOPER_PACING_VISUAL):
         self.bot.auto_click = True
         self.bot.auto_mark = True
         self.bot.random_step = -1
-        if self.ui is not None:
-            self.ui.menu_action_dict["Auto Click"].setChecked(True)
-            self.ui.menu_action_dict["Auto Mark"].setChecked(True)
-            self.ui.menu_action_dict["Auto Guess"].setChecked(True)
+        self.ui.menu_action_dict["Auto Click"].setChecked(True)
+        self.ui.menu_action_dict["Auto Mark"].setChecked(True)
+        self.ui.menu_action_dict["Auto Guess"].setChecked(True)
         try:
             self.bot_looper.looping = loop_times
+            self.bot_looper.pacing = pacing
             self.bot_pool.start(self.bot_looper)
         except RuntimeError:  # RuntimeError: Internal C++ object (BotLooper) already deleted.
             self.bot_looper = BotLooper()
             self.bot_looper.status.init_map.connect(self.new_game_setup)
             self.bot_looper.status.start_bot.connect(self.start_bot)
             self.bot_looper.looping = loop_times
+            self.bot_looper.pacing = pacing
             self.bot_pool.start(self.bot_looper)
 
     def stop_looper(self):
@@ -754,14 +241,9 @@ class Game(object):
             self.bot.result.stop_solving.emit()  # --> bot
             if self.ui.statistic_dialog is not None:
                 self.ui.statistic_dialog.refresh(self.bot_stat.record_list)
-            while self.bot_looper.looping != 0:
-                time.sleep(0.001)
+            self.bot_looper.wait_looping_stopped()
             self.ui.menu_action_dict["Solve Continuously"].setChecked(False)
 
-    def looper_exited(self):
-        if self.ui is None:
-            QTimer.singleShot(0, QApplication.quit)
-
     def ui_init(self):
         self.ui = GameUI(self)
         self.ui.show()
@@ -811,7 +293,7 @@ class LandUI(QPushButton):
         self.land = land
 
         button_size = self.land.mine_field.game.ui.button_size
-        self.setFixedSize(button_size, button_size)
+        self.update_size()
         self.setStyleSheet(
             self.style_sheet
                 .replace("FONT_COLOR", "white")
@@ -820,6 +302,10 @@ class LandUI(QPushButton):
         self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
 
+    def update_size(self):
+        button_size = self.land.mine_field.game.ui.button_size
+        self.setFixedSize(button_size, button_size)
+
     def left_click(self):
         if QApplication.keyboardModifiers() == Qt.KeyboardModifier.ControlModifier:
             self.land.control_left_click()
@@ -892,16 +378,18 @@ class LandUI(QPushButton):
 
 
 class MineFieldUI(QWidget):
+    grid_size = None
 
     def __init__(self, parent):
         super().__init__(parent)
 
-    def init_grid(self):
+    def init_grid(self, field_width, field_height):
         if self.layout() is None:
             grid = QGridLayout()
             grid.setSpacing(0)
             self.setLayout(grid)
-        else:
+        elif self.grid_size != (field_width, field_height):
+            # widgets are only dropped when the field is resized, otherwise they are reused
             grid = self.layout()
             while grid.count() > 0:
                 land_ui = grid.itemAt(0).widget()
@@ -911,6 +399,7 @@ class MineFieldUI(QWidget):
                 land_ui.customContextMenuRequested.disconnect(self.right_click)
                 land_ui.deleteLater()
                 land_ui.setParent(None)
+        self.grid_size = (field_width, field_height)
 
     def add_land(self, land_ui, y, x):
         land_ui.clicked.connect(self.left_click)
@@ -1727,7 +1216,7 @@ class GameUI(QMainWindow):
         file_path, _ = QFileDialog.getOpenFileName(
             None,
             "Load from file",
-            filter="PNG (*.png);;All Files (*)",
+            filter="PNG (*.png);;Board (*.board);;All Files (*)",
         )
         if os.path.isfile(file_path):
             self.game.load(file_path)
@@ -1901,8 +1390,7 @@ class GameUI(QMainWindow):
             land_list = self.game.mine_field.land_list
             focus_land = self.game.mine_field.get_focus()
             if focus_land is None:
-                land_list[int(len(land_list) / 2)].focus = True
-                land_list[int(len(land_list) / 2)].ui.update_display()
+                self.game.mine_field.set_focus(int(len(land_list) / 2))
             else:
                 focus_land_new = focus_land
                 if event.key() in [Qt.Key.Key_W, Qt.Key.Key_Up]:
@@ -1954,7 +1442,7 @@ class GameUI(QMainWindow):
         if self.game.bot and self.game.bot.auto_solving:
             self.game.bot.result.stop_solving.emit()
         self.game.global_stat.put({
-            "game_id": self.game.id,
+            "worker_id": self.game.id,
             "exit": True,
         })
         event.accept()
@@ -1979,110 +1467,263 @@ class GameUI(QMainWindow):
 
     def bot_highlight(self, land, _type):  # <-- bot
         land.ui.highlight(_type)
+        self.game.mine_field.mark_decorated(land.id)
         self.game.bot.result.game_update_completed.emit()  # --> bot
 
 
-PROCESS_COUNT = 30
+# games of every preset played headless, in jobs of JOB_GAME_COUNT games
 LOOP_COUNT = 1000 * 1000 * 30
+JOB_GAME_COUNT = 100
+
+# headless workers send their records in batches, when this many are kept or this many seconds passed
+STAT_FLUSH_COUNT = 100
+STAT_FLUSH_INTERVAL = 1
+# seconds the main process waits for a record before it looks for workers which died without the exit message
+STAT_POLL_INTERVAL = 1
+# a record of a batch is a tuple of these
+STAT_RECORD_KEY_LIST = ["game_id", "win", "click", "mark", "random_click", "usage_time", "save_file", ]
+# running sums of the records of every preset, usage_time only sums the games won
+STAT_SUM_KEY_LIST = ["no", "win", "lose", "click", "mark", "random_click", "usage_time", ]
 
 
 def main():
-    ui = "on"
-    if len(sys.argv) > 1 and sys.argv[1] == "--headless":
-        ui = "off"
-    if ui == "on":
-        game_count = 1
-    else:
-        game_count = len(PRESET) * PROCESS_COUNT
+    parser = argparse.ArgumentParser(description="A MineSweeper game, with a MineSweeper bot")
+    parser.add_argument(
+        "--headless", action="store_true",
+        help="let the bot play without window and print the statistic")
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1,
+        help="number of processes playing headless, the number of cpus by default")
+    parser.add_argument(
+        "--pin-cpu", action="store_true",
+        help="keep every headless process on its own cpu")
+    parser.add_argument(
+        "--stat-flush-count", type=int, default=STAT_FLUSH_COUNT,
+        help="number of records a headless process sends at once")
+    parser.add_argument(
+        "--stat-flush-interval", type=float, default=STAT_FLUSH_INTERVAL,
+        help="seconds a headless process keeps its records at most, checked when a game is finished")
+    parser.add_argument(
+        "--stat-file",
+        help="append every headless record to this file as a line of json")
+    parser.add_argument(
+        "--debug-check", action="store_true",
+        help="compare the land counters with a full scan whenever they are read")
+    args = parser.parse_args()
 
     global_stat = dict()
     for i in range(len(PRESET)):
-        global_stat[i % len(PRESET)] = list()
+        global_stat[i % len(PRESET)] = {key: 0 for key in STAT_SUM_KEY_LIST}
+    stat_file = None
+    if args.headless and args.stat_file is not None:
+        stat_file = open(args.stat_file, "a")
 
     start_time = datetime.datetime.now()
 
     global_stat_queue = multiprocessing.Queue()
-    game_list = list()
-    for i in range(game_count):
-        game = multiprocessing.Process(target=create_new_game, args=(i, global_stat_queue, ui, ))
-        game_list.append(game)
-        game.start()
-
-    game_exit_list = [False for _ in game_list]
-    while not all(game_exit_list):
+    job_queue = None
+    if args.headless:
+        worker_count = max(1, args.workers)
+        job_queue = multiprocessing.Queue(maxsize=worker_count * 2)
+        process_list = [
+            multiprocessing.Process(target=run_worker, args=(
+                i, job_queue, global_stat_queue, args.pin_cpu, args.stat_flush_count, args.stat_flush_interval,
+                args.debug_check, ))
+            for i in range(worker_count)
+        ]
+    else:
+        process_list = [multiprocessing.Process(target=create_new_game, args=(0, global_stat_queue, args.debug_check, ))]
+    for process in process_list:
+        process.start()
+    if job_queue is not None:
+        # started after the processes, no thread is running while they are forked
+        threading.Thread(target=feed_job, args=(job_queue, len(process_list), ), daemon=True).start()
+
+    process_exit_list = [False for _ in process_list]
+    interrupted = False
+    while not all(process_exit_list):
+        # a process found dead before the wait has nothing left in the queue once the wait times out
+        dead_list = [not process.is_alive() for process in process_list]
         try:
-            r = global_stat_queue.get()
-            if "exit" in r:
-                game_exit_list[r["game_id"]] = True
-                continue
+            r = global_stat_queue.get(timeout=STAT_POLL_INTERVAL)
+        except queue.Empty:
+            for i, dead in enumerate(dead_list):
+                if dead and not process_exit_list[i]:
+                    print(f"Process {i} exited without notice, exit code {process_list[i].exitcode}")
+                    process_exit_list[i] = True
+            continue
         except KeyboardInterrupt:
-            break
-
-        if ui == "off":
-            process_global_stat(global_stat, start_time, r)
-
+            if interrupted:
+                break
+            # the processes are interrupted too, wait for the games they finished
+            interrupted = True
+            continue
+        if isinstance(r, list):
+            # batch of a headless process
+            for record in r:
+                process_global_stat(global_stat, start_time, dict(zip(STAT_RECORD_KEY_LIST, record)), stat_file)
+            continue
+        if "exit" in r:
+            process_exit_list[r["worker_id"]] = True
+            continue
+
+        if args.headless:
+            process_global_stat(global_stat, start_time, r, stat_file)
+
+    if stat_file is not None:
+        stat_file.close()
+    if job_queue is not None:
+        # jobs left in the queue are dropped
+        job_queue.cancel_join_thread()
     try:
-        for game in game_list:
-            game.join()
+        for process in process_list:
+            process.join()
     except KeyboardInterrupt:
         try:
-            for game in game_list:
-                game.terminate()
-                game.join()
+            for process in process_list:
+                process.terminate()
+                process.join()
         except KeyboardInterrupt:
             pass
 
 
-def create_new_game(index, global_stat, ui):
+def feed_job(job_queue, worker_count):
+    # (preset, seed) jobs taking turns between the presets, then one None for every worker to stop
+    seed_random = Random()
+    for _ in range(LOOP_COUNT // JOB_GAME_COUNT):
+        for preset_id in range(len(PRESET)):
+            job_queue.put((preset_id, seed_random.randint(0, MINE_SEED_MAX), ))
+    for _ in range(worker_count):
+        job_queue.put(None)
+
+
+def run_worker(worker_id, job_queue, global_stat_queue, pin_cpu=False,
+               stat_flush_count=STAT_FLUSH_COUNT, stat_flush_interval=STAT_FLUSH_INTERVAL, debug_check=False):
+    if pin_cpu and hasattr(os, "sched_setaffinity"):
+        cpu_list = sorted(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, [cpu_list[worker_id % len(cpu_list)]])
+
+    # one game by preset, the id tells the preset as game_id % len(PRESET)
+    game_dict = dict()
+    global_stat = GlobalStatBatch(global_stat_queue, stat_flush_count, stat_flush_interval)
+    try:
+        while True:
+            job = job_queue.get()
+            if job is None:
+                break
+            preset_id, seed = job
+            if preset_id not in game_dict:
+                game_dict[preset_id] = mine_engine.Game(worker_id * len(PRESET) + preset_id, global_stat)
+                game_dict[preset_id].mine_field.debug_check = debug_check
+                game_dict[preset_id].new_game_setup(
+                    field_width=PRESET[preset_id][0],
+                    field_height=PRESET[preset_id][1],
+                    mine_count=PRESET[preset_id][2],
+                )
+            game = game_dict[preset_id]
+            seed_random = Random(seed)
+            for _ in range(JOB_GAME_COUNT):
+                game.new_game_setup()
+                game.mine_field.mine_seed = seed_random.randint(0, MINE_SEED_MAX)
+                game.play()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # records of the finished games are all sent before the exit, even when a game raised,
+        # the traceback of which is printed by multiprocessing as the exception leaves the process
+        global_stat.flush()
+        global_stat_queue.put({
+            "worker_id": worker_id,
+            "exit": True,
+        })
+
+
+class GlobalStatBatch(object):
+    # takes the place of the global_stat queue in a headless process, records are sent in batches of tuples
+    queue = None
+    flush_count = STAT_FLUSH_COUNT
+    flush_interval = STAT_FLUSH_INTERVAL
+
+    record_list = None
+    flush_time = 0
+
+    def __init__(self, queue, flush_count=STAT_FLUSH_COUNT, flush_interval=STAT_FLUSH_INTERVAL):
+        self.queue = queue
+        self.flush_count = flush_count
+        self.flush_interval = flush_interval
+        self.record_list = list()
+        self.flush_time = time.monotonic() + self.flush_interval
+
+    def put(self, r):
+        self.record_list.append(tuple(r[key] for key in STAT_RECORD_KEY_LIST))
+        if len(self.record_list) >= self.flush_count or time.monotonic() >= self.flush_time:
+            self.flush()
+
+    def flush(self):
+        if len(self.record_list) > 0:
+            self.queue.put(self.record_list)
+            self.record_list = list()
+        self.flush_time = time.monotonic() + self.flush_interval
+
+
+def create_new_game(index, global_stat, debug_check=False):
     qt_app = QApplication(sys.argv)
-    if ui == "on":
-        qt_app.setStyle("Fusion")
-        qt_app.setPalette(dark_theme.PALETTE)
+    qt_app.setStyle("Fusion")
+    qt_app.setPalette(dark_theme.PALETTE)
 
     game = Game(index, global_stat)
+    game.mine_field.debug_check = debug_check
     game.new_game_setup(
         field_width=PRESET[index % len(PRESET)][0],
         field_height=PRESET[index % len(PRESET)][1],
         mine_count=PRESET[index % len(PRESET)][2],
     )
-    if ui == "on":
-        game.ui_init()
-        game.ui_setup()
-    else:
-        game.start_looper(LOOP_COUNT)
+    game.ui_init()
+    game.ui_setup()
 
     qt_app.exec()
 
     global_stat.put({
-        "game_id": index,
+        "worker_id": index,
         "exit": True,
     })
 
 
-def process_global_stat(global_stat, start_time, r):
+def process_global_stat(global_stat, start_time, r, stat_file=None):
     preset_id = r["game_id"] % len(PRESET)
-    global_stat[preset_id].append(r)
-
-    no = len(global_stat[preset_id])
-    win = len([r for r in global_stat[preset_id] if r["win"] is True])
-    lose = len([r for r in global_stat[preset_id] if r["win"] is False])
+    stat = global_stat[preset_id]
+    stat["no"] += 1
+    if r["win"] is True:
+        stat["win"] += 1
+        stat["usage_time"] += r["usage_time"]
+    elif r["win"] is False:
+        stat["lose"] += 1
+    stat["click"] += r["click"]
+    stat["mark"] += r["mark"]
+    stat["random_click"] += r["random_click"]
+    if stat_file is not None:
+        stat_file.write(json.dumps(r) + "\n")
+
+    no = stat["no"]
+    win = stat["win"]
+    lose = stat["lose"]
     win_rate = 0
     if win + lose > 0:
         win_rate = win / (win + lose)
-    click = sum([r["click"] for r in global_stat[preset_id]])
-    mark = sum([r["mark"] for r in global_stat[preset_id]])
-    guess = sum([r["random_click"] for r in global_stat[preset_id]])
+    click = stat["click"]
+    mark = stat["mark"]
+    guess = stat["random_click"]
     guess_suc_rate = 0
     if guess > 0:
         guess_suc_rate = (guess - lose) / guess
-    total_time = sum([r["usage_time"] for r in global_stat[preset_id] if r["win"] is True])
+    total_time = stat["usage_time"]
     avg_time = 0
     if win > 0:
         avg_time = total_time / win
 
     pass_time = (datetime.datetime.now() - start_time).seconds
     log_line = ", ".join([
-        f"Game/s: {sum([len(x) for x in global_stat.values()]) / (pass_time if pass_time > 0 else 1):.2f}",
+        f"Game/s: {sum([x["no"] for x in global_stat.values()]) / (pass_time if pass_time > 0 else 1):.2f}",
         f"[stat {preset_id}] Game: {r["game_id"]:2d}",
         f"No.{no}: {" WIN" if r["win"] else "LOSE"}",
         f"Minefield: {PRESET[preset_id][0]:2d}x{PRESET[preset_id][1]:2d}/{PRESET[preset_id][2]:2d}",
@@ -2099,9 +1740,8 @@ def process_global_stat(global_stat, start_time, r):
     print(log_line)
 
 
-class Bot(QRunnable):
-    game = None
-
+class Bot(mine_engine.Solver, QRunnable):
+    # runs mine_engine.Solver in the thread pool, moves are sent to Game through signals
     class Result(QObject):
         click = Signal(object)  # --> Master
         random_click = Signal(object)  # --> Master
@@ -2115,47 +1755,40 @@ class Bot(QRunnable):
         stop_solving = Signal()  # Master ->
         bot_finished = Signal()  # Master ->
 
-    auto_click = False
-    auto_mark = False
-    auto_step = -1
-    random_step = 0
     game_updating = False
-
     auto_solving = False
-    condition_list = list()
-    # global_condition = None
-    condition_id_list = list()
-    random_choice_list = list()
-    iter_result_save = None
-    result = None
-
-    data_before_solve = None
 
-    debug_print = False
+    result = None
+    # wakes run up when the game is updated or solving is stopped
+    update_condition = None
 
     def __init__(self, game):
-        super().__init__()
-        self.game = game
+        super().__init__(game)
 
         self.setAutoDelete(False)
+        self.update_condition = threading.Condition()
         self.result = Bot.Result()
         self.result.game_update_completed.connect(self.game_update_completed)
         self.result.stop_solving.connect(self.stop_solving)
 
     def game_update_completed(self):
-        if self.game.terminated:
-            self.auto_solving = False
-        self.game_updating = False
+        with self.update_condition:
+            if self.game.terminated:
+                self.auto_solving = False
+            self.game_updating = False
+            self.update_condition.notify_all()
 
     def stop_solving(self):
-        self.auto_solving = False
+        with self.update_condition:
+            self.auto_solving = False
+            self.update_condition.notify_all()
 
     @Slot()
     def run(self):
         self.auto_solving = True
         self.game_updating = False
         while self.auto_solving and self.auto_step != 0:
-            self.data_before_solve = self.game.mine_field.save()
+            self.changed_id_list = self.game.mine_field.checkpoint()
             self.game_updating = True
             # import traceback
             # try:
@@ -2167,628 +1800,33 @@ class Bot(QRunnable):
                 break
             if self.auto_step > 0:
                 self.auto_step -= 1
-            while self.auto_solving and self.auto_step != 0 and self.game_updating:
+            with self.update_condition:
                 # wait until game update completed
-                time.sleep(0.001)
+                self.update_condition.wait_for(
+                    lambda: not (self.auto_solving and self.auto_step != 0 and self.game_updating))
         self.auto_solving = False
         self.result.bot_finished.emit()
 
-    def solve(self):
-        self.collect_condition(shuffle_result=True if self.auto_step == -1 else False)
-        # print("[Bot] Try to analyse ...")
-        if all([land.checked is False for land in self.game.mine_field.land_list]):
-            if self.auto_click:
-                self.result.emote.emit(":D")
-                return self.random_click(is_first_click=True)
-            else:
-                print("[Bot] No conclusion found.")
-                self.result.emote.emit(":(")
-                self.result.message.emit(f"No conclusion found")
-                return False
-
-        confirm_result_dict = self.analyse_condition(return_instantly=True if self.auto_step == -1 else False)
-        if len(confirm_result_dict.keys()) > 0:
-            for land_id, have_mine in confirm_result_dict.items():
-                land = self.game.mine_field.land(land_id)
-                if not have_mine:
-                    if self.auto_click:
-                        self.result.click.emit(land)
-                        break
-                    else:
-                        print(f"[Bot] ({land.x}, {land.y}) {land.id} is empty")
-                        self.result.message.emit(f"({land.x + 1}, {land.y + 1}) is empty")
-                        self.result.highlight.emit(land, "safe")
-                else:
-                    if self.auto_mark:
-                        self.result.mark.emit(land)
-                        break
-                    else:
-                        print(f"[Bot] ({land.x}, {land.y}) {land.id} have mine")
-                        self.result.message.emit(f"({land.x + 1}, {land.y + 1}) have mine")
-                        self.result.highlight.emit(land, "danger")
-                self.result.emote.emit(":D")
-                self.random_choice_list = list()
-                if self.debug_print:
-                    for cond in self.condition_list:
-                        print(cond)
-            return True
-
-        self.result.emote.emit(":(")
-        possible_mine_list, possible_safe_list, possibility_dict = self.analyse_possibility()
-        self.analyse_mark_count(possible_mine_list, possible_safe_list, possibility_dict)
-
-        if self.random_step == -1 or self.random_step > 0:
-            if self.random_step > 0:
-                self.random_step -= 1
-            return self.random_click()
-        else:
-            print("[Bot] No conclusion found.")
-            self.result.message.emit(f"No conclusion found")
-            return False
-
-    @staticmethod
-    def generate_cond_id(cond):
-        return f"{cond["land"]}:" \
-               f"{",".join([str(x) for x in sorted(cond["adj_land"])])}_" \
-               f"{cond["possible_mine_min"]}-{cond["possible_mine"]}"
-
-    def collect_condition(self, shuffle_result=False):
-        mine_field = self.game.mine_field
-        self.condition_list = list()
-        self.condition_id_list = list()
-        # self.global_condition = {
-        #     "id": "",
-        #     "land": -9,
-        #     "possible_mine": mine_field.mine_count - mine_field.marked_land_count(),
-        #     "possible_mine_min": -1,
-        #     "adj_land": list(),
-        #     "derivation": "-9",
-        #     "final_cal": "",
-        # }
-        # self.global_condition["possible_mine_min"] = self.global_condition["possible_mine"]
-        for land in mine_field.land_list:
-            if land.checked and land.adjacent_mine_count != 0:
-                x, y = land.x, land.y
-                condition = {
-                    "id": "",
-                    "land": land.id,
-                    "possible_mine": land.adjacent_mine_count,
-                    "possible_mine_min": -1,
-                    "adj_land": list(),
-                    "derivation": f"{land.id}",
-                    "final_cal": "",
-                }
-                for _x, _y in itertools.product([-1, 0, 1], [-1, 0, 1]):
-                    if _x == 0 and _y == 0:
-                        continue
-                    if 0 <= x + _x < mine_field.field_width and 0 <= y + _y < mine_field.field_height:
-                        adj_land = mine_field.land((x + _x) + mine_field.field_width * (y + _y))
-                        if not adj_land.checked:
-                            if adj_land.cover != SYMBOL_FLAG:
-                                condition["adj_land"].append(adj_land.id)
-                            else:
-                                condition["possible_mine"] -= 1
-
-                if condition["possible_mine"] > 0 or len(condition["adj_land"]) > 0:
-                    if shuffle_result:
-                        shuffle(condition["adj_land"])
-                    condition["possible_mine_min"] = condition["possible_mine"]
-                    self.condition_list.append(condition)
-
-            # if not land.checked and land.cover != SYMBOL_FLAG:
-            #     self.global_condition["adj_land"].append(land.id)
-
-        # self.condition_list.append(global_cond)
-
-        for cond in self.condition_list:
-            cond["id"] = self.generate_cond_id(cond)
-            self.condition_id_list.append(cond["id"])
-
-        if shuffle_result:
-            shuffle(self.condition_list)
-
-    def random_click(self, is_first_click=False):
-        mine_field = self.game.mine_field
-        if len(self.random_choice_list) != 0:
-            land_list = [land for land in mine_field.land_list if land.id in self.random_choice_list]
-        else:
-            land_list = [land for land in mine_field.land_list if not land.checked and land.cover not in [
-                SYMBOL_FLAG,
-                SYMBOL_UNKNOWN,
-            ]]
-        x = randint(0, len(land_list) - 1)
-        if is_first_click:
-            self.result.click.emit(land_list[x])
-        else:
-            if self.debug_print:
-                print("[Bot] Random Click")
-            self.result.random_click.emit(land_list[x])
-        return True
-
-    def iter_mine_position(self):
-        if self.iter_result_save is not None:
-            return self.iter_result_save
-
-        adj_condition_dict = dict()
-        adj_land_list = list()
-        for condition in self.condition_list:
-            if condition["final_cal"] == "":
-                adj_condition_dict[condition["land"]] = {
-                    "land": condition["land"],
-                    "adj_land": condition["adj_land"],
-                    "mine_count": condition["possible_mine"],
-                    "mine_count_test": 0,
-                }
-                for land in condition["adj_land"]:
-                    if land not in adj_land_list:
-                        adj_land_list.append(land)
-        adj_land_list.sort()
-
-        adj_land_group_list = list()
-        checked_land_list = list()
-
-        for land in adj_land_list:
-            if land in checked_land_list:
-                continue
-            temp_group_list = [land]
-            checked_land_list.append(land)
-            i = 0
-            while i < len(temp_group_list):
-                for _adj_land in self.game.mine_field.land_get_neighbor(temp_group_list[i]):
-                    if _adj_land in adj_land_list and _adj_land not in temp_group_list:
-                        temp_group_list.append(_adj_land)
-                        checked_land_list.append(_adj_land)
-                    elif _adj_land in adj_condition_dict:
-                        for __adj_land in adj_condition_dict[_adj_land]["adj_land"]:
-                            if __adj_land not in checked_land_list:
-                                temp_group_list.append(__adj_land)
-                                checked_land_list.append(__adj_land)
-                i += 1
-
-            adj_land_group_list.append(temp_group_list)
-
-        # print(adj_land_group_list)
-        adj_land_group_list = sorted(adj_land_group_list, key=lambda x: len(x))
-        # for i in adj_land_group_list:
-        #     print(i)
-
-        iter_result_list = list()
-        mine_count_total = self.game.mine_field.mine_count - self.game.mine_field.marked_land_count()
-        mine_count_current = mine_count_total
-        for adj_land_group in adj_land_group_list:
-            mine_count_iter_max = min(mine_count_current, len(adj_land_group), 8)
-            counter = 0
-            comb_count = math.comb(len(adj_land_group), mine_count_iter_max)
-            # print("iter:", len(adj_land_group), mine_count_iter_max, comb_count)
-            # print(adj_land_group)
-            if comb_count < 30 * 1000:
-                adj_condition_group_list = list()
-                for land in adj_land_group:
-                    for neighbor_land in self.game.mine_field.land_get_neighbor(land):
-                        if neighbor_land in adj_condition_dict and neighbor_land not in adj_condition_group_list:
-                            adj_condition_group_list.append(neighbor_land)
-                # print("adj_cond_group_list", adj_condition_group_list)
-                iter_result_group_list = list()
-                for mine_count in range(1, mine_count_iter_max + 1):
-                    for indices in itertools.combinations(range(len(adj_land_group)), mine_count):
-                        counter += 1
-                        for land, condition in adj_condition_dict.items():
-                            adj_condition_dict[land]["mine_count_test"] = 0
-                        for i in indices:
-                            for neighbor_land in self.game.mine_field.land_get_neighbor(adj_land_group[i]):
-                                if neighbor_land in adj_condition_dict:
-                                    adj_condition_dict[neighbor_land]["mine_count_test"] += 1
-                                    # adj_condition_group_list.append(land)
-                        if all([adj_condition_dict[land]["mine_count"] == adj_condition_dict[land]["mine_count_test"] for land in adj_condition_group_list]):
-                            iter_result_group_list.append([adj_land_group[i] for i in indices])
-
-                # print("iter_result:", len(iter_result_group_list), "/", counter)
-                # for i in iter_result_group_list:
-                #     print(i)
-                if len(iter_result_group_list) > 0:
-                    iter_result_list.append(iter_result_group_list)
-                    mine_count_current -= min([len(x) for x in iter_result_group_list])
-            else:
-                # print("comb too large:", comb_count)
-                iter_result_list = list()
-                break
+    def move_click(self, land):
+        self.result.click.emit(land)
 
-        res = list()
-        if len(iter_result_list) > 0:
-            product_count = functools.reduce(operator.mul, [len(x) for x in iter_result_list], 1)
-            if product_count < 30 * 1000:
-                # print("product count:", product_count)
-                for _group in itertools.product(*iter_result_list):
-                    # print(_group)
-                    res.append([_item for _list in _group for _item in _list])
-            else:
-                # print("product too large:", product_count)
-                pass
+    def move_random_click(self, land):
+        self.result.random_click.emit(land)
 
-        # print("iter_result_product:", len(res))
-        # for i in res:
-        #     print(i)
+    def move_mark(self, land):
+        self.result.mark.emit(land)
 
-        self.iter_result_save = res, adj_land_list
-        return res, adj_land_list
+    def show_emote(self, emote):
+        self.result.emote.emit(emote)
 
-    def analyse_condition(self, return_instantly=False):
-        global_condition_added = False
-        confirm_result_dict = dict()
-        while True:
-            for condition in self.condition_list:
-                if condition["possible_mine"] == 0:
-                    for land in condition["adj_land"]:
-                        if land not in confirm_result_dict:
-                            confirm_result_dict[land] = False
-                            if return_instantly:
-                                return confirm_result_dict
-                        elif confirm_result_dict[land] is not False:
-                            print("conflict 01:", land)
-
-                elif condition["possible_mine"] == len(condition["adj_land"]):
-                    for land in condition["adj_land"]:
-                        if land not in confirm_result_dict:
-                            confirm_result_dict[land] = True
-                            if return_instantly:
-                                return confirm_result_dict
-                        elif confirm_result_dict[land] is not True:
-                            print("conflict 02:", land)
-
-            condition_updated = False
-            for a, b in itertools.product(range(len(self.condition_list)), range(len(self.condition_list))):
-                if a >= b:
-                    continue
-                if len(self.condition_list[a]["adj_land"]) >= len(self.condition_list[b]["adj_land"]):
-                    cond_a, cond_b = self.condition_list[a], self.condition_list[b]
-                else:
-                    cond_a, cond_b = self.condition_list[b], self.condition_list[a]
-                # if cond_a["land"] == cond_b["land"]:
-                #     continue
-                sub_adj, inter_adj, cond_a_new_adj, cond_b_new_adj = \
-                    self.sub(cond_a["adj_land"], cond_b["adj_land"], lambda x: x)
-                if self.is_include(cond_a["adj_land"], cond_b["adj_land"], lambda x: x):
-                    if len(sub_adj) > 0 and cond_a["possible_mine"] - cond_b["possible_mine"] in [
-                        0,  # sub_adj is all empty
-                        len(sub_adj),  # sub_adj is all mine
-                    ]:
-                        cond_new = {
-                            "id": "",
-                            "land": f"{cond_a["land"]}",
-                            "adj_land": sub_adj,
-                            "possible_mine": cond_a["possible_mine"] - cond_b["possible_mine"],
-                            "possible_mine_min": cond_a["possible_mine"] - cond_b["possible_mine"],
-                            "derivation": f"({cond_a["derivation"]}) - ({cond_b["derivation"]})",
-                            "final_cal": f"{cond_a["id"]} - {cond_b["id"]}",
-                        }
-                        cond_new["id"] = self.generate_cond_id(cond_new)
-                        if cond_new["id"] not in self.condition_id_list:
-                            # print("1 ==>", cond_new)
-                            self.condition_list.append(cond_new)
-                            self.condition_id_list.append(cond_new["id"])
-                            condition_updated = True
-
-                    elif len(cond_a_new_adj) > 0:
-                        cond_a_new = cond_a.copy()
-                        cond_a_new.update({
-                            "adj_land": cond_a_new_adj,
-                            "possible_mine": cond_a["possible_mine"] - cond_b["possible_mine"],
-                            "possible_mine_min": cond_a["possible_mine"] - cond_b["possible_mine"],
-                            "derivation": f"({cond_a["derivation"]}) - ({cond_b["derivation"]})",
-                            "final_cal": f"{cond_a["id"]} - {cond_b["id"]}",
-                        })
-                        cond_a_new["id"] = self.generate_cond_id(cond_a_new)
-                        if cond_a_new["id"] not in self.condition_id_list:
-                            # print("2 ==>", cond_a_new)
-                            self.condition_list.append(cond_a_new)
-                            self.condition_id_list.append(cond_a_new["id"])
-                            condition_updated = True
-                elif len(inter_adj) > 0 and "x" not in cond_a["final_cal"] and "x" not in cond_b["final_cal"]:
-                    min_a = max(0, cond_a["possible_mine"] - len(cond_a_new_adj))
-                    min_b = max(0, cond_b["possible_mine"] - len(cond_b_new_adj))
-                    max_a = min(len(inter_adj), cond_a["possible_mine"])
-                    max_b = min(len(inter_adj), cond_b["possible_mine"])
-                    cond_new = {
-                        "id": "",
-                        "land": f"{cond_a["land"]}",
-                        "adj_land": inter_adj,
-                        "possible_mine": min(max_a, max_b),
-                        "possible_mine_min": max(min_a, min_b),
-                        "derivation": f"({cond_a["derivation"]}) x ({cond_b["derivation"]})",
-                        "final_cal": f"{cond_a["id"]} x {cond_b["id"]}",
-                    }
-                    if cond_new["possible_mine"] == cond_new["possible_mine_min"]:
-                        cond_new["id"] = self.generate_cond_id(cond_new)
-                        if cond_new["id"] not in self.condition_id_list:
-                            # print("3 ==>", cond_new)
-                            self.condition_list.append(cond_new)
-                            self.condition_id_list.append(cond_new["id"])
-                            condition_updated = True
-                        else:
-                            pass
-                            # cond_dup = [x for x in self.condition_list if x["id"] == cond_new["id"]][0]
-                            # if f"{cond_new["adj_land"]} {cond_new["possible_mine"]} {cond_new["possible_mine_min"]}" \
-                            #         != f"{cond_dup["adj_land"]} {cond_dup["possible_mine"]} {cond_dup["possible_mine_min"]}":
-                            #     print("3 ==/", cond_new)
-                            #     print("3 dup", cond_dup)
-
-            # if len(confirm_result_dict) == 0 and not condition_updated and not global_condition_added:
-            #     print("condition_list len:", len(self.condition_list))
-            #
-            #     self.global_condition["id"] = self.generate_cond_id(self.global_condition)
-            #
-            #     self.condition_list.append(self.global_condition)
-            #     self.condition_id_list.append(self.global_condition["id"])
-            #
-            #     print("global_condition added")
-            #
-            #     condition_updated = True
-            #     global_condition_added = True
-            #
-            # if global_condition_added:
-            #     print("condition_list len:", len(self.condition_list))
-
-            if not condition_updated:
-                break
-        # for cond in self.condition_list:
-        #     print(cond)
-        # print("condition_list len:", len(self.condition_list))
-
-        if len(confirm_result_dict.keys()) == 0:
-            iter_result_list, adj_land_list = self.iter_mine_position()
-
-            if len(iter_result_list) > 0:
-                cover_mine_count = self.game.mine_field.cover_mine_count()
-                if min([len(x) for x in iter_result_list]) == max([len(x) for x in iter_result_list]):
-                    iter_result_union = set()
-                    for i in iter_result_list:
-                        iter_result_union |= set(i)
-                    if len(iter_result_union) < len(adj_land_list):
-                        for land in set(adj_land_list) - iter_result_union:
-                            confirm_result_dict[land] = False
-                        self.iter_result_save = None
-                    if cover_mine_count - len(iter_result_list[0]) == self.game.mine_field.cover_land_count() - len(adj_land_list):
-                        for land in self.game.mine_field.land_list:
-                            if not land.checked and land.cover != SYMBOL_FLAG and land.id not in adj_land_list:
-                                confirm_result_dict[land.id] = True
-                        self.iter_result_save = None
-                elif len(adj_land_list) == self.game.mine_field.cover_land_count() \
-                        and any([len(x) == cover_mine_count for x in iter_result_list]):
-                    iter_result_list_matched = [x for x in iter_result_list if len(x) == cover_mine_count]
-                    if len(iter_result_list_matched) == 1:
-                        for land in adj_land_list:
-                            if land in iter_result_list[0]:
-                                confirm_result_dict[land] = False
-                            else:
-                                confirm_result_dict[land] = True
-                        self.iter_result_save = None
-                    else:
-                        iter_result_union = set()
-                        for i in iter_result_list_matched:
-                            iter_result_union |= set(i)
-                        if len(iter_result_union) < len(adj_land_list):
-                            for land in set(adj_land_list) - iter_result_union:
-                                confirm_result_dict[land] = False
-                            self.iter_result_save = None
-
-        return confirm_result_dict
-
-    def analyse_possibility(self) -> (list, list, dict, ):
-        mine_field = self.game.mine_field
-        cover_land_count = self.game.mine_field.cover_land_count()
-        cover_mine_count = self.game.mine_field.cover_mine_count()
-        if cover_land_count == 0:
-            avg_mine_rate = 1.0
-        else:
-            avg_mine_rate = cover_mine_count / cover_land_count
-        max_mine_rate, min_mine_rate = avg_mine_rate, avg_mine_rate
-
-        all_adj_land_dict, none_adj_land_dict = dict(), dict()
-        for condition in self.condition_list:
-            for land in condition["adj_land"]:
-                if land not in all_adj_land_dict:
-                    all_adj_land_dict[land] = {
-                        "id": land,
-                        "mine_rate": avg_mine_rate,
-
-                        "mine_rate_v1": avg_mine_rate,
-                        "mine_rate_v1_history": [(avg_mine_rate, "None", )],
-                        "mine_rate_v2": avg_mine_rate,
-                        "mine_rate_v2_history": [(avg_mine_rate, "None", )],
-                        "mine_rate_v3": avg_mine_rate,
-                        "mine_rate_v3_history": [(avg_mine_rate, "None", )],
-                    }
-        iter_result_list, adj_land_list = self.iter_mine_position()
-        self.iter_result_save = None
-
-        none_adj_mine_rate = avg_mine_rate
-        adj_mine_rate = avg_mine_rate
-        if len(iter_result_list) > 0 and len(all_adj_land_dict.keys()) < cover_land_count:
-            if min([len(x) for x in iter_result_list]) == max([len(x) for x in iter_result_list]):
-                none_adj_mine_rate = (cover_mine_count - len(iter_result_list[0])) / (cover_land_count - len(adj_land_list))
-                adj_mine_rate = len(iter_result_list[0]) / len(adj_land_list)
-                # print(none_adj_mine_rate, adj_mine_rate)
-
-        for land in mine_field.land_list:
-            if not land.checked and land.cover == SYMBOL_BLANK:
-                if land.id in all_adj_land_dict:
-                    if all_adj_land_dict[land.id]["mine_rate_v3"] == avg_mine_rate:
-                        all_adj_land_dict[land.id]["mine_rate_v3"] = adj_mine_rate
-                else:
-                    none_adj_land_dict[land.id] = {
-                        "id": land,
-                        # "mine_rate": avg_mine_rate,
-                        "mine_rate": none_adj_mine_rate,
-                    }
-        for condition in self.condition_list:
-            # print(condition)
-            cond_mine_rate = condition["possible_mine"] / len(condition["adj_land"])
-            for land in condition["adj_land"]:
-                # # version_1
-                # if cond_mine_rate >= 0.5:
-                #     if cond_mine_rate > all_adj_land_dict[land]["mine_rate_v1"]:
-                #         all_adj_land_dict[land]["mine_rate_v1"] = cond_mine_rate
-                #         all_adj_land_dict[land]["mine_rate_v1_history"].append((cond_mine_rate, condition["id"], ))
-                # else:
-                #     if all_adj_land_dict[land]["mine_rate_v1"] >= 0.5:
-                #         pass
-                #     elif abs(cond_mine_rate - avg_mine_rate) \
-                #             > abs(all_adj_land_dict[land]["mine_rate_v1"] - avg_mine_rate):
-                #         all_adj_land_dict[land]["mine_rate_v1"] = cond_mine_rate
-                #         all_adj_land_dict[land]["mine_rate_v1_history"].append((cond_mine_rate, condition["id"], ))
-
-                # # version_2
-                # if abs(cond_mine_rate - avg_mine_rate) > abs(all_adj_land_dict[land]["mine_rate_v2"] - avg_mine_rate):
-                #     all_adj_land_dict[land]["mine_rate_v2"] = cond_mine_rate
-                #     all_adj_land_dict[land]["mine_rate_v2_history"].append((cond_mine_rate, condition["id"], ))
-
-                # version_3
-                confirm_rate = 0.7
-                if adj_mine_rate >= confirm_rate or cond_mine_rate >= confirm_rate:
-                    if cond_mine_rate > all_adj_land_dict[land]["mine_rate_v3"]:
-                        all_adj_land_dict[land]["mine_rate_v3"] = cond_mine_rate
-                        all_adj_land_dict[land]["mine_rate_v3_history"].append((cond_mine_rate, condition["id"],))
-                else:
-                    cond_confident = abs(cond_mine_rate - adj_mine_rate)
-                    if cond_mine_rate < adj_mine_rate:
-                        cond_confident /= adj_mine_rate
-                    else:
-                        cond_confident /= confirm_rate - adj_mine_rate
-                    record_confident = abs(all_adj_land_dict[land]["mine_rate_v3"] - adj_mine_rate)
-                    if all_adj_land_dict[land]["mine_rate_v3"] < adj_mine_rate:
-                        record_confident /= adj_mine_rate
-                    else:
-                        record_confident /= confirm_rate - adj_mine_rate
-                    if cond_confident > record_confident:
-                        all_adj_land_dict[land]["mine_rate_v3"] = cond_mine_rate
-                        all_adj_land_dict[land]["mine_rate_v3_history"].append((cond_mine_rate, condition["id"], ))
-
-                # version selection
-                all_adj_land_dict[land]["mine_rate"] = all_adj_land_dict[land]["mine_rate_v3"]
-
-        for _, land in itertools.chain(all_adj_land_dict.items(), none_adj_land_dict.items()):
-            # if not (land["mine_rate_v1"] == land["mine_rate_v2"] == land["mine_rate_v3"]):
-            #     print("::::", land["id"], self.game.mine_field.land(land["id"]).content == SYMBOL_MINE)
-            #     print("v1", land["mine_rate_v1"], land["mine_rate_v1_history"])
-            #     print("v2", land["mine_rate_v2"], land["mine_rate_v2_history"])
-            #     print("v3", land["mine_rate_v3"], land["mine_rate_v3_history"])
-            max_mine_rate = max(max_mine_rate, land["mine_rate"])
-            min_mine_rate = min(min_mine_rate, land["mine_rate"])
-        high_mine_rate_list, high_safe_rate_list, rate_dict = list(), list(), dict()
-        for _id, land in itertools.chain(all_adj_land_dict.items(), none_adj_land_dict.items()):
-            cover = "{:.2f}" \
-                .format(land["mine_rate"]) \
-                .replace("0.", ".") \
-                .replace("1.00", "1.0")
-            if land["mine_rate"] == max_mine_rate:
-                if self.game.ui is not None and self.game.ui.ui_activated:
-                    self.result.custom_cover_ui.emit(mine_field.land(_id), cover, "#e08080")
-                high_mine_rate_list.append(_id)
-                rate_dict[_id] = land["mine_rate"]
-            elif land["mine_rate"] == min_mine_rate:
-                if self.game.ui is not None and self.game.ui.ui_activated:
-                    self.result.custom_cover_ui.emit(mine_field.land(_id), cover, "#80e080")
-                high_safe_rate_list.append(_id)
-                rate_dict[_id] = land["mine_rate"]
-            else:
-                if self.game.ui is not None and self.game.ui.ui_activated:
-                    self.result.custom_cover_ui.emit(mine_field.land(_id), cover, "#909090")
-        # avg_cover = "{:.2f}" \
-        #     .format(avg_mine_rate) \
-        #     .replace("0.", ".") \
-        #     .replace("1.00", "1.0")
-        # for land in mine_field.land_list:
-        #     if land.checked or land.cover != SYMBOL_BLANK or land.id in all_adj_land_dict:
-        #         continue
-        # for _id, land in none_adj_land_dict.items():
-        #     if max_mine_rate == avg_mine_rate:
-        #         if self.game.ui is not None and self.game.ui.ui_activated:
-        #             self.result.custom_cover_ui.emit(mine_field.land(_id), avg_cover, "#e08080")
-        #         high_mine_rate_list.append(_id)
-        #         rate_dict[_id] = avg_mine_rate
-        #     elif min_mine_rate == avg_mine_rate:
-        #         if self.game.ui is not None and self.game.ui.ui_activated:
-        #             self.result.custom_cover_ui.emit(mine_field.land(_id), avg_cover, "#80e080")
-        #         high_safe_rate_list.append(_id)
-        #         rate_dict[_id] = avg_mine_rate
-        #     else:
-        #         if self.game.ui is not None and self.game.ui.ui_activated:
-        #             self.result.custom_cover_ui.emit(mine_field.land(_id), avg_cover, "#909090")
-
-        # print(f"[bot {self.game.id}] "
-        #       f"cond_list: {len(self.condition_list)}, "
-        #       f"possible_mine_list: {len(high_mine_rate_list)} ({max_mine_rate:.2f}), "
-        #       f"possible_safe_list: {len(high_safe_rate_list)} ({min_mine_rate:.2f}), "
-        #       f"avg: {avg_mine_rate:.2f}")
-        return high_mine_rate_list, high_safe_rate_list, rate_dict
-
-    def analyse_mark_count(self, possible_mine_list, possible_safe_list, possibility_dict):
-        mine_field = self.game.mine_field
-        if len(possible_safe_list) > 0:
-            choice_list = possible_safe_list
-        else:
-            choice_list = [land.id for land in mine_field.land_list if not land.checked and land.cover not in [
-                SYMBOL_FLAG,
-                SYMBOL_UNKNOWN,
-            ]]
-            if len(choice_list) > len(possible_mine_list):
-                choice_list = [land_id for land_id in choice_list[:] if land_id not in possible_mine_list]
-
-        # print("choice_list", len(choice_list))
-
-        if len(choice_list) > 0 and choice_list[0] in possibility_dict and possibility_dict[choice_list[0]] > 0.3:  # >= 1/3
-            mark_count = dict()
-            min_mark_count = mine_field.mine_count
-            for land_id in choice_list:
-                mark_count[land_id] = \
-                    mine_field.row_mark_count(land_id) \
-                    + mine_field.col_mark_count(land_id) \
-                    + mine_field.range_mark_count(land_id, 2)
-                min_mark_count = min(min_mark_count, mark_count[land_id])
+    def show_message(self, message):
+        self.result.message.emit(message)
 
-            # print(f"[bot {self.game.id}]", "choice_list:", "[" + ", ".join([f"{x}: {mark_count[x]}" for x in choice_list]) + "]")
+    def show_highlight(self, land, _type):
+        self.result.highlight.emit(land, _type)
 
-            choice_list = [x for x in choice_list[:] if mark_count[x] == min_mark_count]
-
-            # for land_id in choice_list:
-            #     print(land_id, mark_count[land_id])
-            # print("choice_list filter by mine count", len(choice_list), choice_list)
-
-        self.random_choice_list = choice_list[:]
-
-    @staticmethod
-    def is_include(a, b, func):
-        if len(a) < len(b):
-            _b, _a = sorted(a), sorted(b)
-        else:
-            _a, _b = sorted(a), sorted(b)
-        i, j, k = 0, 0, 0
-        while i < len(_a) and j < len(_b):
-            if func(_a[i]) == func(_b[j]):
-                i += 1
-                j += 1
-                k += 1
-            elif func(_a[i]) < func(_b[j]):
-                i += 1
-            else:
-                j += 1
-        return k == len(_b)
-
-    @staticmethod
-    def sub(a, b, func):
-        i, j = 0, 0
-        _a, _b, _c = sorted(a), sorted(b), list()
-        while i < len(_a) and j < len(_b):
-            __a, __b = func(_a[i]), func(_b[j])
-            if __a == __b:
-                _c.append(_a[i])
-                _a.remove(_a[i])
-                _b.remove(_b[j])
-            elif __a < __b:
-                i += 1
-            else:
-                j += 1
-        return _a if len(_a) > 0 else _b, _c, _a, _b
+    def show_mine_rate(self, land, cover, color):
+        self.result.custom_cover_ui.emit(land, cover, color)
 
 
 class BotLooper(QRunnable):
@@ -2798,27 +1836,45 @@ class BotLooper(QRunnable):
         start_bot = Signal()         # --> Master
         bot_finished = Signal()      # Master -->
         stop_looping = Signal()     # Master -->
-        looping_exited = Signal()  # --> Master
 
     looping = 0
+    pacing = LOOPER_PACING_VISUAL
     map_initializing = False
     bot_running = False
+    # wakes run up when the map is ready, the bot is finished or looping is stopped
+    condition = None
 
     def __init__(self):
         super().__init__()
+        self.condition = threading.Condition()
         self.status = BotLooper.Status()
         self.status.map_ready.connect(self.map_ready)
         self.status.bot_finished.connect(self.bot_finished)
         self.status.stop_looping.connect(self.stop_looping)
 
     def map_ready(self):
-        self.map_initializing = False
+        with self.condition:
+            self.map_initializing = False
+            self.condition.notify_all()
 
     def bot_finished(self):
-        self.bot_running = False
+        with self.condition:
+            self.bot_running = False
+            self.condition.notify_all()
 
     def stop_looping(self):
-        self.looping = 0
+        with self.condition:
+            self.looping = 0
+            self.condition.notify_all()
+
+    def wait_for(self, predicate, timeout=None):
+        # wait until predicate is true or looping is stopped
+        with self.condition:
+            self.condition.wait_for(lambda: predicate() or self.looping == 0, timeout)
+
+    def wait_looping_stopped(self):
+        with self.condition:
+            self.condition.wait_for(lambda: self.looping == 0)
 
     @Slot()
     def run(self):
@@ -2826,21 +1882,17 @@ class BotLooper(QRunnable):
             # print("[Looper] Start Bot", self.looping, datetime.datetime.now())
             self.bot_running = True
             self.status.start_bot.emit()
-            while self.bot_running:
-                time.sleep(0.001)
-                if self.looping == 0:
-                    break
+            self.wait_for(lambda: not self.bot_running)
             if self.looping == 0:
                 break
             # print("[Looper] Bot Complete", self.looping, datetime.datetime.now())
 
-            for _ in range(1000):
-                time.sleep(0.001)
-                if self.looping == 0:
-                    break
+            if self.pacing > 0:
+                self.wait_for(lambda: False, self.pacing)
 
-            if self.looping > 0:
-                self.looping -= 1
+            with self.condition:
+                if self.looping > 0:
+                    self.looping -= 1
 
             if self.looping == 0:
                 break
@@ -2848,81 +1900,13 @@ class BotLooper(QRunnable):
             # print("[Looper] Init Map", self.looping, datetime.datetime.now())
             self.map_initializing = True
             self.status.init_map.emit()
-            while self.map_initializing:
-                time.sleep(0.001)
-                if self.looping == 0:
-                    break
+            self.wait_for(lambda: not self.map_initializing)
             if self.looping == 0:
                 break
             # print("[Looper] Map Init Complete", self.looping, datetime.datetime.now())
 
-            for _ in range(1000):
-                time.sleep(0.001)
-                if self.looping == 0:
-                    break
-
-        self.status.looping_exited.emit()
-
-
-class BotStat:
-    game = None
-
-    record_list = None
-    current = -1
-
-    def __init__(self, game):
-        self.game = game
-        self.record_list = list()
-
-    def create_record(self):
-        record = {
-            "no": len(self.record_list) + 1,
-            "win": None,
-            "click": 0,
-            "mark": 0,
-            "random_click": 0,
-            "start_time": datetime.datetime.now(),
-            "usage_time": 0,
-        }
-        self.record_list.append(record)
-        self.current += 1
-
-    def clear_record(self):
-        self.record_list = list()
-        self.current = -1
-
-    def record_click(self):
-        if self.current < 0:
-            self.create_record()
-        self.record_list[self.current]["click"] += 1
-
-    def record_mark(self):
-        if self.current < 0:
-            self.create_record()
-        self.record_list[self.current]["mark"] += 1
-
-    def record_random_click(self):
-        if self.current < 0:
-            self.create_record()
-        self.record_list[self.current]["random_click"] += 1
-
-    def record_game_result(self, game_result):
-        if self.current >= 0 and self.record_list[self.current]["win"] is None:
-            time_delta = datetime.datetime.now() - self.record_list[self.current]["start_time"]
-            self.record_list[self.current]["usage_time"] = float(f"{time_delta.seconds}.{time_delta.microseconds}")
-            if game_result in ["WIN", "LOSE"]:
-                self.record_list[self.current]["win"] = game_result == "WIN"
-            # print(self.record_list[self.current])
-
-    def to_global_stat(self, save_file_path=None):
-        if len(self.record_list) > 0:
-            r = self.record_list[-1].copy()
-
-            r.update({
-                "game_id": self.game.id,
-                "save_file": save_file_path,
-            })
-            self.game.global_stat.put(r)
+            if self.pacing > 0:
+                self.wait_for(lambda: False, self.pacing)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,1863 @@
+# rules, solver and statistic of MineSweeperBot, usable without Qt
+
+from array import array
+from collections import deque
+from random import Random, randint, shuffle
+
+import datetime
+import gzip
+import itertools
+import math
+import operator
+import os
+import struct
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+SAFETY_LEVEL_DEFAULT = 1
+
+MIN_WIDTH = 3
+MAX_WIDTH = 1000
+
+MIN_HEIGHT = 3
+MAX_HEIGHT = 1000
+
+SYMBOL_BLANK = " "
+SYMBOL_MINE = "X"
+SYMBOL_FLAG = "!"
+SYMBOL_WRONG_FLAG = "#"
+SYMBOL_UNKNOWN = "?"
+
+MINE_SEED_MAX = 2 ** 32 - 1
+
+# life cycle of MineField
+FIELD_STATE_EMPTY = "EMPTY"  # no mine placed yet
+FIELD_STATE_GENERATED = "GENERATED"  # mines placed or loaded, game in progress
+FIELD_STATE_TERMINATED = "TERMINATED"  # game won or lost
+
+NEIGHBOR_TABLE_CACHE_SIZE = 8
+NEIGHBOR_TABLE_CACHE = dict()
+
+
+def neighbor_table(field_width, field_height):
+    # CSR style table, neighbors of land i are index_list[offset_list[i]:offset_list[i + 1]]
+    key = (field_width, field_height, )
+    if key in NEIGHBOR_TABLE_CACHE:
+        return NEIGHBOR_TABLE_CACHE[key]
+
+    offset_list = array("I", [0])
+    index_list = array("I")
+    for y in range(field_height):
+        for x in range(field_width):
+            for _x, _y in itertools.product([-1, 0, 1], [-1, 0, 1]):
+                if _x == 0 and _y == 0:
+                    continue
+                if 0 <= x + _x < field_width and 0 <= y + _y < field_height:
+                    index_list.append((x + _x) + field_width * (y + _y))
+            offset_list.append(len(index_list))
+
+    if len(NEIGHBOR_TABLE_CACHE) >= NEIGHBOR_TABLE_CACHE_SIZE:
+        # drop the oldest table
+        del NEIGHBOR_TABLE_CACHE[next(iter(NEIGHBOR_TABLE_CACHE))]
+    NEIGHBOR_TABLE_CACHE[key] = offset_list, index_list
+    return offset_list, index_list
+
+
+COVER_BLANK = 0
+COVER_FLAG = 1
+COVER_UNKNOWN = 2
+COVER_MINE = 3
+
+COVER_SYMBOL_LIST = [SYMBOL_BLANK, SYMBOL_FLAG, SYMBOL_UNKNOWN, SYMBOL_MINE, ]
+COVER_CODE_DICT = {symbol: code for code, symbol in enumerate(COVER_SYMBOL_LIST)}
+
+CONTENT_SYMBOL_LIST = [SYMBOL_BLANK] + [f"{x}" for x in range(1, 9)]
+
+# maps a cover plane onto a plane holding 1 for flagged lands
+FLAG_TRANSLATE_TABLE = bytes(1 if code == COVER_FLAG else 0 for code in range(256))
+# split a cover plane into its low and high bit, and join them back
+COVER_LOW_TRANSLATE_TABLE = bytes(code & 1 for code in range(256))
+COVER_HIGH_TRANSLATE_TABLE = bytes(code >> 1 & 1 for code in range(256))
+COVER_HIGH_RESTORE_TABLE = bytes(min(code, 1) << 1 for code in range(256))
+
+# binary board format, the header is followed by bit-packed planes of
+# mine, revealed, cover low bit and cover high bit, (land_count + 7) // 8 bytes each
+BOARD_MAGIC = b"MSBB"
+BOARD_VERSION = 1
+BOARD_HEADER = struct.Struct("<4sBHHIi")  # magic, version, field_width, field_height, mine_count, focus_id
+# a saved file is a png screenshot followed by the gzip compressed board,
+# or the compressed board alone when saved without a window (.board)
+GZIP_MAGIC = b"\x1f\x8b"
+# keys of a land in the json board written by older versions
+LAND_JSON_KEY_SET = {"x", "y", "id", "cover", "content", "have_mine", "adjacent_mine_count", "checked", "focus", }
+
+BIT_CHAR_TABLE = bytes(ord("1") if code else ord("0") for code in range(256))
+CHAR_BIT_TABLE = bytes(1 if code == ord("1") else 0 for code in range(256))
+
+
+def pack_plane(plane):
+    # one bit per land, land 0 goes to the lowest bit of the first byte
+    bit_string = plane.translate(BIT_CHAR_TABLE)[::-1]
+    return int(bit_string, 2).to_bytes((len(plane) + 7) // 8, "little")
+
+
+def unpack_plane(data, land_count):
+    bit_string = format(int.from_bytes(data, "little"), f"0{land_count}b")[::-1][:land_count]
+    return bit_string.encode("ascii").translate(CHAR_BIT_TABLE)
+
+
+class Land(object):
+    # thin view over the planes of MineField, only position and widget are stored here
+    __slots__ = ("mine_field", "x", "y", "id", "ui", )
+
+    def __init__(self, mine_field, x, y):
+        self.mine_field = mine_field
+        self.x, self.y = x, y
+        self.id = x + self.mine_field.field_width * y
+        self.ui = None
+
+    @property
+    def have_mine(self):
+        return self.mine_field.mine_plane[self.id] == 1
+
+    @have_mine.setter
+    def have_mine(self, value):
+        self.mine_field.journal_land(self.id)
+        self.mine_field.mine_plane[self.id] = 1 if value else 0
+        self.mine_field.mark_dirty(self.id)
+
+    @property
+    def adjacent_mine_count(self):
+        return self.mine_field.adjacent_plane[self.id]
+
+    @adjacent_mine_count.setter
+    def adjacent_mine_count(self, value):
+        self.mine_field.journal_land(self.id)
+        self.mine_field.adjacent_plane[self.id] = value
+        self.mine_field.mark_dirty(self.id)
+
+    @property
+    def checked(self):
+        return self.mine_field.revealed_plane[self.id] == 1
+
+    @checked.setter
+    def checked(self, value):
+        self.mine_field.set_revealed(self.id, value)
+
+    @property
+    def cover(self):
+        return COVER_SYMBOL_LIST[self.mine_field.cover_plane[self.id]]
+
+    @cover.setter
+    def cover(self, value):
+        self.mine_field.set_cover(self.id, COVER_CODE_DICT[value])
+
+    @property
+    def content(self):
+        if self.have_mine:
+            return SYMBOL_MINE
+        return CONTENT_SYMBOL_LIST[self.adjacent_mine_count]
+
+    @property
+    def focus(self):
+        return self.mine_field.focus_id == self.id
+
+    @focus.setter
+    def focus(self, value):
+        if value:
+            self.mine_field.set_focus(self.id)
+        elif self.mine_field.focus_id == self.id:
+            self.mine_field.set_focus(-1)
+
+    @property
+    def wrong_flag(self):
+        return self.mine_field.wrong_flag_plane[self.id] == 1
+
+    @wrong_flag.setter
+    def wrong_flag(self, value):
+        self.mine_field.journal_land(self.id)
+        self.mine_field.wrong_flag_plane[self.id] = 1 if value else 0
+        self.mine_field.mark_dirty(self.id)
+
+    def left_click(self):
+        if self.mine_field.game.terminated or not self.mine_field.game.terminated and self.cover in [
+            SYMBOL_FLAG,
+            SYMBOL_UNKNOWN,
+        ]:
+            # prevent changing check status
+            if self.ui is not None:
+                self.ui.setChecked(self.checked)
+            return
+
+        # print(f"Click ({self.x}, {self.y})")
+        if self.mine_field.state == FIELD_STATE_EMPTY:
+            if self.mine_field.game.safety_level >= 1:
+                # first click always safe
+                self.mine_field.generate_mine(self.x, self.y)
+            else:
+                self.mine_field.generate_mine()
+
+        self.mine_field.reveal(self.id)
+
+        if self.mine_field.game.safety_level >= 2:
+            mine_plane = self.mine_field.mine_plane
+            revealed_plane = self.mine_field.revealed_plane
+            adjacent_plane = self.mine_field.adjacent_plane
+            for _id in range(len(self.mine_field.land_list)):
+                if self.mine_field.game.terminated:
+                    break
+                if not revealed_plane[_id] and not mine_plane[_id] and adjacent_plane[_id] == 0:
+                    self.mine_field.reveal(_id)
+
+        # the button toggles itself when clicked, repaint it even if nothing changed
+        self.mine_field.mark_dirty(self.id)
+        self.mine_field.set_focus(self.id)
+
+        if self.mine_field.game.ui is not None:
+            self.mine_field.game.ui.update_title()
+            if not self.mine_field.game.terminated:
+                self.mine_field.game.ui.set_message(
+                    f"{self.mine_field.mine_count - self.mine_field.marked_land_count()} mines left")
+
+    def auto_click(self):
+        # print(f"Auto Click")
+        self.left_click()
+
+    def right_click(self):
+        if not self.mine_field.game.terminated:
+            # print(f"Mark  ({self.x}, {self.y})")
+            if not self.checked:
+                if self.cover == SYMBOL_BLANK:
+                    self.cover = SYMBOL_FLAG
+                elif self.cover == SYMBOL_FLAG:
+                    self.cover = SYMBOL_UNKNOWN
+                elif self.cover == SYMBOL_UNKNOWN:
+                    self.cover = SYMBOL_BLANK
+                else:
+                    self.cover = SYMBOL_FLAG
+            self.mine_field.set_focus(self.id)
+            if self.mine_field.game.ui is not None:
+                self.mine_field.game.ui.update_title()
+                self.mine_field.game.ui.set_message(
+                    f"{self.mine_field.mine_count - self.mine_field.marked_land_count()} mines left")
+
+    def auto_mark(self):
+        # print(f"Auto Mark")
+        while not self.mine_field.game.terminated and self.cover != SYMBOL_FLAG:
+            self.right_click()
+
+    def control_left_click(self):
+        if not self.mine_field.game.edit_mode or self.mine_field.game.terminated:
+            self.ui.setChecked(self.checked)
+            return
+
+        if self.mine_field.state == FIELD_STATE_EMPTY:
+            self.mine_field.generate_mine()
+
+        if self.checked:
+            self.checked = False
+        if not self.have_mine:
+            self.have_mine = True
+            self.mine_field.mine_count += 1
+        else:
+            self.have_mine = False
+            self.mine_field.mine_count -= 1
+            if self.mine_field.mine_count == 0:
+                self.mine_field.state = FIELD_STATE_EMPTY
+
+        for _id in self.mine_field.land_get_neighbor(self.id):
+            adj_land = self.mine_field.land_list[_id]
+            if self.have_mine:
+                adj_land.adjacent_mine_count += 1
+            else:
+                adj_land.adjacent_mine_count -= 1
+        self.mine_field.update_display()
+        if self.mine_field.game.ui is not None:
+            self.mine_field.game.ui.update_title()
+
+    def control_right_click(self):
+        if not self.mine_field.game.edit_mode or self.mine_field.game.terminated:
+            return
+
+        if self.checked:
+            self.checked = False
+
+        self.mine_field.mark_dirty(self.id)
+        self.mine_field.update_display()
+
+        if self.mine_field.game.ui is not None:
+            self.mine_field.game.ui.update_title()
+
+    def to_string(self):
+        return f"{self.id} ({self.x}, {self.y})"
+
+    def load(self, data):
+        for key in data:
+            if key in ["x", "y", "id", "content", ]:
+                # position is fixed by the view, content is derived from mine and adjacent count
+                continue
+            setattr(self, key, data[key])
+
+
+class LandList(object):
+    # sequence of Land views, a view is only created when the land is visited
+    mine_field = None
+    field_size = None
+    view_list = None
+
+    def __init__(self, mine_field):
+        self.mine_field = mine_field
+        self.field_size = (mine_field.field_width, mine_field.field_height)
+        self.view_list = [None] * (mine_field.field_width * mine_field.field_height)
+
+    def __len__(self):
+        return len(self.view_list)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.view_list)))]
+        land = self.view_list[index]
+        if land is None:
+            if index < 0:
+                index += len(self.view_list)
+            land = Land(self.mine_field, index % self.mine_field.field_width, index // self.mine_field.field_width)
+            self.view_list[index] = land
+        return land
+
+    def __iter__(self):
+        for i in range(len(self.view_list)):
+            yield self[i]
+
+    def created(self):
+        # views which already exist, e.g. the ones holding a widget
+        return [land for land in self.view_list if land is not None]
+
+
+class MineField(object):
+    game = None
+
+    field_width = 0
+    field_height = 0
+    mine_count = 0
+    state = FIELD_STATE_EMPTY
+    # seed of the mine placement, set it before the first click to reproduce a board
+    mine_seed = None
+
+    # one byte per land, indexed by land id
+    mine_plane = None
+    adjacent_plane = None
+    revealed_plane = None
+    cover_plane = None
+    wrong_flag_plane = None
+
+    focus_id = -1
+    # lands changed since the last repaint, only tracked while the ui is attached
+    dirty_id_set = None
+    # lands painted over by the bot, mine rate or highlight, cleared on the next repaint
+    decorated_id_set = None
+
+    # kept up to date on every change of revealed_plane and cover_plane
+    revealed_count = 0
+    marked_count = 0
+    # compare the counters with a full scan whenever they are read
+    debug_check = False
+
+    # every land changed since checkpoint() with its revealed, cover and wrong flag at that time,
+    # together with the counters, focus and state, None while no checkpoint is set
+    journal_dict = None
+    journal_status = None
+
+    # shared neighbor table of the current field size, see neighbor_table()
+    neighbor_offset_list = None
+    neighbor_index_list = None
+
+    land_list = None
+
+    ui = None
+
+    def __init__(self, game):
+        self.game = game
+        self.init_mine_field()
+
+    def init_mine_field(self):
+        self.field_width = min(max(MIN_WIDTH, self.field_width), MAX_WIDTH)
+        self.field_height = min(max(MIN_HEIGHT, self.field_height), MAX_HEIGHT)
+        self.mine_count = min(max(1, self.mine_count), (self.field_width - 1) * (self.field_height - 1))
+
+        land_count = self.field_width * self.field_height
+        if self.land_list is not None and self.land_list.field_size == (self.field_width, self.field_height):
+            # same size as the last game, clear the planes in place and keep the views with their widgets
+            zero = bytes(land_count)
+            for plane in [
+                self.mine_plane,
+                self.adjacent_plane,
+                self.revealed_plane,
+                self.cover_plane,
+                self.wrong_flag_plane,
+            ]:
+                plane[:] = zero
+        else:
+            self.mine_plane = bytearray(land_count)
+            self.adjacent_plane = bytearray(land_count)
+            self.revealed_plane = bytearray(land_count)
+            self.cover_plane = bytearray(land_count)
+            self.wrong_flag_plane = bytearray(land_count)
+            self.neighbor_offset_list, self.neighbor_index_list = neighbor_table(self.field_width, self.field_height)
+            self.land_list = LandList(self)
+        self.revealed_count, self.marked_count = 0, 0
+        self.focus_id = -1
+        self.dirty_id_set = set()
+        self.decorated_id_set = set()
+        self.journal_dict, self.journal_status = None, None
+        self.mine_seed = None
+        self.state = FIELD_STATE_EMPTY
+
+    def reset_mine_field(self):
+        land_count = self.field_width * self.field_height
+        self.revealed_plane[:] = bytes(land_count)
+        self.cover_plane[:] = bytes(land_count)
+        self.wrong_flag_plane[:] = bytes(land_count)
+        self.revealed_count, self.marked_count = 0, 0
+        self.focus_id = -1
+        self.dirty_id_set.clear()
+        self.decorated_id_set.clear()
+        self.journal_dict, self.journal_status = None, None
+        if self.state == FIELD_STATE_TERMINATED:
+            self.state = FIELD_STATE_GENERATED
+        for land in self.land_list.created():
+            if land.ui is not None:
+                land.ui.update_display()
+
+    def generate_mine(self, safe_x=-9, safe_y=-9, seed=None):
+        if seed is None:
+            seed = self.mine_seed if self.mine_seed is not None else randint(0, MINE_SEED_MAX)
+        self.mine_seed = seed
+
+        land_count = self.field_width * self.field_height
+        self.mine_plane[:] = bytes(land_count)
+        self.adjacent_plane[:] = bytes(land_count)
+        self.revealed_plane[:] = bytes(land_count)
+        self.revealed_count, self.marked_count = self.scan_land_count()
+        # the planes are rewritten without the journal, the next step collects every condition from scratch
+        self.journal_dict, self.journal_status = None, None
+
+        safe_id_set = set()
+        for _x, _y in itertools.product([-1, 0, 1], [-1, 0, 1]):
+            if 0 <= safe_x + _x < self.field_width and 0 <= safe_y + _y < self.field_height:
+                safe_id_set.add((safe_x + _x) + self.field_width * (safe_y + _y))
+        if len(safe_id_set) > 0:
+            candidate_id_list = [_id for _id in range(land_count) if _id not in safe_id_set]
+        else:
+            candidate_id_list = range(land_count)
+        if len(candidate_id_list) < self.mine_count:
+            # the safe area leaves less room than the mines on tiny fields, only the clicked land stays safe
+            candidate_id_list = [_id for _id in range(land_count) if _id != safe_x + self.field_width * safe_y]
+        mine_id_list = Random(seed).sample(candidate_id_list, self.mine_count)
+
+        for mine_id in mine_id_list:
+            self.mine_plane[mine_id] = 1
+        self.add_adjacent_mine(mine_id_list)
+        self.state = FIELD_STATE_GENERATED
+
+        if self.game.edit_mode and self.ui is not None:
+            # mines are visible in edit mode
+            self.dirty_id_set.update(range(land_count))
+
+        self.game.start_time = datetime.datetime.now()
+
+    def add_adjacent_mine(self, mine_id_list):
+        # adjacent counts in one scatter pass over the shared neighbor table
+        offset_list, index_list = self.neighbor_offset_list, self.neighbor_index_list
+        adjacent_plane = self.adjacent_plane
+        for mine_id in mine_id_list:
+            for _id in index_list[offset_list[mine_id]:offset_list[mine_id + 1]]:
+                adjacent_plane[_id] += 1
+
+    def field_size(self):
+        return {
+            "field_width": self.field_width,
+            "field_height": self.field_height,
+            "mine_count": self.mine_count,
+        }
+
+    def land(self, _id=None, x=None, y=None):
+        if type(_id) is int:
+            return self.land_list[_id]
+        elif type(x) is int and type(y) is int:
+            x = max(0, min(x, self.field_width - 1))
+            y = max(0, min(y, self.field_height - 1))
+            return self.land_list[x + y * self.field_width]
+        else:
+            return None
+
+    def land_is_neighbor(self, a_id, b_id):
+        return a_id == b_id or b_id in self.land_get_neighbor(a_id)
+
+    def land_get_neighbor(self, _id):
+        return self.neighbor_index_list[self.neighbor_offset_list[_id]:self.neighbor_offset_list[_id + 1]]
+
+    def reveal(self, _id):
+        # open the land, and keep opening around every opened land whose mines are all flagged,
+        # returns ids of newly revealed lands
+        mine_plane = self.mine_plane
+        adjacent_plane = self.adjacent_plane
+        revealed_plane = self.revealed_plane
+        cover_plane = self.cover_plane
+        offset_list, index_list = self.neighbor_offset_list, self.neighbor_index_list
+
+        revealed_id_list = list()
+        mine_id = -1
+        if not revealed_plane[_id]:
+            self.set_revealed(_id, True)
+            revealed_id_list.append(_id)
+            if mine_plane[_id]:
+                mine_id = _id
+        queue = deque([_id]) if mine_id < 0 else deque()
+        while len(queue) > 0:
+            land_id = queue.popleft()
+            neighbor_id_list = index_list[offset_list[land_id]:offset_list[land_id + 1]]
+            if adjacent_plane[land_id] > 0:
+                flag_num = 0
+                for neighbor_id in neighbor_id_list:
+                    if not revealed_plane[neighbor_id] and cover_plane[neighbor_id] == COVER_FLAG:
+                        flag_num += 1
+                if flag_num < adjacent_plane[land_id]:
+                    continue
+            for neighbor_id in neighbor_id_list:
+                if not revealed_plane[neighbor_id] and cover_plane[neighbor_id] != COVER_FLAG \
+                        and cover_plane[neighbor_id] != COVER_UNKNOWN:
+                    self.journal_land(neighbor_id)
+                    revealed_plane[neighbor_id] = 1
+                    self.revealed_count += 1
+                    self.mark_dirty(neighbor_id)
+                    revealed_id_list.append(neighbor_id)
+                    if mine_plane[neighbor_id]:
+                        # wrong flag around, stop at the first mine
+                        mine_id = neighbor_id
+                        queue.clear()
+                        break
+                    queue.append(neighbor_id)
+
+        if mine_id >= 0:
+            self.check_end_game(mine_id % self.field_width, mine_id // self.field_width)
+        else:
+            self.check_end_game(_id % self.field_width, _id // self.field_width)
+        return revealed_id_list
+
+    def get_focus(self):
+        if self.focus_id >= 0:
+            return self.land_list[self.focus_id]
+        return None
+
+    def set_focus(self, _id):
+        if self.focus_id != _id:
+            self.mark_dirty(self.focus_id)
+            self.mark_dirty(_id)
+            self.focus_id = _id
+        self.update_display()
+
+    def mark_dirty(self, _id):
+        if self.ui is not None and _id >= 0:
+            self.dirty_id_set.add(_id)
+
+    def mark_decorated(self, _id):
+        if self.ui is not None and _id >= 0:
+            self.decorated_id_set.add(_id)
+
+    def update_display(self):
+        # repaint the lands changed since the last repaint, and the ones the bot painted over
+        self.dirty_id_set.update(self.decorated_id_set)
+        self.decorated_id_set.clear()
+        for _id in self.dirty_id_set:
+            land = self.land_list[_id]
+            if land.ui is not None:
+                land.ui.update_display()
+        self.dirty_id_set.clear()
+
+    def clickable_land_id_list(self):
+        # not revealed and neither flagged nor marked as unknown
+        return [
+            _id for _id, (revealed, cover) in enumerate(zip(self.revealed_plane, self.cover_plane))
+            if not revealed and cover not in [COVER_FLAG, COVER_UNKNOWN, ]
+        ]
+
+    def set_revealed(self, _id, value):
+        value = 1 if value else 0
+        if self.revealed_plane[_id] == value:
+            return
+        self.journal_land(_id)
+        self.revealed_plane[_id] = value
+        self.mark_dirty(_id)
+        self.revealed_count += 1 if value else -1
+        if self.cover_plane[_id] == COVER_FLAG:
+            self.marked_count += -1 if value else 1
+
+    def set_cover(self, _id, code):
+        if not self.revealed_plane[_id]:
+            self.marked_count += (code == COVER_FLAG) - (self.cover_plane[_id] == COVER_FLAG)
+        if self.cover_plane[_id] != code:
+            self.journal_land(_id)
+            self.cover_plane[_id] = code
+            self.mark_dirty(_id)
+
+    def checkpoint(self):
+        # start journaling, the board as it is now can be brought back by swap_checkpoint(),
+        # returns the lands changed since the previous checkpoint, None if there was none
+        changed_id_list = list(self.journal_dict) if self.journal_dict is not None else None
+        self.journal_dict = dict()
+        self.journal_status = (self.revealed_count, self.marked_count, self.focus_id, self.state, )
+        return changed_id_list
+
+    def journal_land(self, _id):
+        # call before changing a land, only its first change after the checkpoint is kept
+        if self.journal_dict is not None and _id not in self.journal_dict:
+            self.journal_dict[_id] = (self.revealed_plane[_id], self.cover_plane[_id], self.wrong_flag_plane[_id], )
+
+    def swap_checkpoint(self):
+        # switch between the board at the checkpoint and the current one, calling it again switches back,
+        # widgets are not repainted
+        journal_dict = dict()
+        for _id, (revealed, cover, wrong_flag) in self.journal_dict.items():
+            journal_dict[_id] = (self.revealed_plane[_id], self.cover_plane[_id], self.wrong_flag_plane[_id], )
+            self.revealed_plane[_id], self.cover_plane[_id], self.wrong_flag_plane[_id] = revealed, cover, wrong_flag
+        self.journal_dict = journal_dict
+        journal_status = (self.revealed_count, self.marked_count, self.focus_id, self.state, )
+        self.revealed_count, self.marked_count, self.focus_id, self.state = self.journal_status
+        self.journal_status = journal_status
+
+    def scan_land_count(self):
+        flag_plane = self.cover_plane.translate(FLAG_TRANSLATE_TABLE)
+        return self.revealed_plane.count(1), sum(map(operator.gt, flag_plane, self.revealed_plane))
+
+    def check_land_count(self):
+        revealed_count, marked_count = self.scan_land_count()
+        if self.revealed_count != revealed_count:
+            raise RuntimeError(f"revealed count {self.revealed_count} != {revealed_count}")
+        if self.marked_count != marked_count:
+            raise RuntimeError(f"marked count {self.marked_count} != {marked_count}")
+
+    def revealed_land_count(self):
+        if self.debug_check:
+            self.check_land_count()
+        return self.revealed_count
+
+    def marked_land_count(self):
+        if self.debug_check:
+            self.check_land_count()
+        return self.marked_count
+
+    def cover_land_count(self):
+        return self.field_width * self.field_height - self.revealed_land_count() - self.marked_land_count()
+
+    def cover_mine_count(self):
+        return self.mine_count - self.marked_land_count()
+
+    def row_mark_count(self, _id):
+        x, y = _id % self.field_width, _id // self.field_width
+        count = 0
+        for _x in range(0, self.field_width):
+            if _x == x:
+                continue
+            if self.cover_plane[_x + self.field_width * y] == COVER_FLAG:
+                count += 1
+        return count
+
+    def col_mark_count(self, _id):
+        x, y = _id % self.field_width, _id // self.field_width
+        count = 0
+        for _y in range(0, self.field_height):
+            if _y == y:
+                continue
+            if self.cover_plane[x + self.field_width * _y] == COVER_FLAG:
+                count += 1
+        return count
+
+    def range_mark_count(self, _id, distance=1):
+        x, y = _id % self.field_width, _id // self.field_width
+        count = 0
+        total = 0
+        range_array = range(-distance, distance + 1)
+        for _x, _y in itertools.product(range_array, range_array):
+            if _x == 0 and _y == 0:
+                continue
+            if 0 <= (x + _x) < self.field_width and 0 <= (y + _y) < self.field_height:
+                total += 1
+                if self.cover_plane[x + _x + self.field_width * (y + _y)] == COVER_FLAG:
+                    count += 1
+        return int(count / total * 8)
+
+    def check_end_game(self, x, y):
+        land_id_range = range(self.field_width * self.field_height)
+        if self.mine_plane[x + self.field_width * y]:
+            self.game.end_time = datetime.datetime.now()
+            self.game.terminated = True
+            self.game.result = "LOSE"
+            self.state = FIELD_STATE_TERMINATED
+            if self.game.ui is not None:
+                self.game.ui.set_message("YOU LOSE")
+            for _id in itertools.compress(land_id_range, self.mine_plane):
+                if self.cover_plane[_id] != COVER_FLAG:
+                    self.set_cover(_id, COVER_MINE)
+            for _id in itertools.compress(land_id_range, self.cover_plane.translate(FLAG_TRANSLATE_TABLE)):
+                if not self.mine_plane[_id]:
+                    self.journal_land(_id)
+                    self.wrong_flag_plane[_id] = 1
+                    self.mark_dirty(_id)
+        elif self.revealed_land_count() == self.field_width * self.field_height - self.mine_count:
+            self.game.end_time = datetime.datetime.now()
+            self.game.terminated = True
+            self.game.result = "WIN"
+            self.state = FIELD_STATE_TERMINATED
+            if self.game.ui is not None:
+                self.game.ui.set_message("YOU WIN")
+            for _id in itertools.compress(land_id_range, self.mine_plane):
+                self.set_cover(_id, COVER_FLAG)
+
+    def save(self):
+        res = bytearray(BOARD_HEADER.pack(
+            BOARD_MAGIC, BOARD_VERSION, self.field_width, self.field_height, self.mine_count, self.focus_id))
+        for plane in [
+            self.mine_plane,
+            self.revealed_plane,
+            self.cover_plane.translate(COVER_LOW_TRANSLATE_TABLE),
+            self.cover_plane.translate(COVER_HIGH_TRANSLATE_TABLE),
+        ]:
+            res += pack_plane(plane)
+        return bytes(res)
+
+    def load(self, data):
+        if isinstance(data, dict):
+            self.load_json(data)
+        elif isinstance(data, (bytes, bytearray, )):
+            self.load_binary(data)
+        else:
+            raise ValueError(f"Unsupported board data: {type(data).__name__}")
+        self.state = FIELD_STATE_GENERATED if 1 in self.mine_plane else FIELD_STATE_EMPTY
+
+    def load_binary(self, data):
+        # the data is checked before the field is touched, a bad board raises ValueError
+        if len(data) < BOARD_HEADER.size:
+            raise ValueError(f"Truncated board header: {len(data)} bytes")
+        magic, version, field_width, field_height, mine_count, focus_id = BOARD_HEADER.unpack_from(data)
+        if magic != BOARD_MAGIC or version != BOARD_VERSION:
+            raise ValueError(f"Unsupported board format: {magic} {version}")
+        if not (MIN_WIDTH <= field_width <= MAX_WIDTH and MIN_HEIGHT <= field_height <= MAX_HEIGHT):
+            raise ValueError(f"Unsupported field size: {field_width}x{field_height}")
+        land_count = field_width * field_height
+        plane_size = (land_count + 7) // 8
+        if len(data) < BOARD_HEADER.size + plane_size * 4:
+            raise ValueError(f"Truncated board planes: {len(data)} bytes")
+        if not -1 <= focus_id < land_count:
+            raise ValueError(f"Focus out of field: {focus_id}")
+        self.field_width, self.field_height, self.mine_count = field_width, field_height, mine_count
+        self.init_mine_field()
+
+        mine_plane, revealed_plane, cover_low_plane, cover_high_plane = [
+            unpack_plane(data[offset:offset + plane_size], land_count)
+            for offset in range(BOARD_HEADER.size, BOARD_HEADER.size + plane_size * 4, plane_size)
+        ]
+        self.mine_plane[:] = mine_plane
+        self.revealed_plane[:] = revealed_plane
+        self.cover_plane[:] = bytes(map(
+            operator.or_, cover_low_plane, cover_high_plane.translate(COVER_HIGH_RESTORE_TABLE)))
+        self.add_adjacent_mine(itertools.compress(range(land_count), self.mine_plane))
+        self.revealed_count, self.marked_count = self.scan_land_count()
+        self.focus_id = focus_id
+
+    def load_json(self, data):
+        # format written by older versions, a dict of every land, checked before the field is touched as well
+        field_width, field_height, mine_count = data["field_width"], data["field_height"], data["mine_count"]
+        if not (isinstance(field_width, int) and isinstance(field_height, int)
+                and MIN_WIDTH <= field_width <= MAX_WIDTH and MIN_HEIGHT <= field_height <= MAX_HEIGHT):
+            raise ValueError(f"Unsupported field size: {field_width}x{field_height}")
+        if not isinstance(mine_count, int) or mine_count < 0:
+            raise ValueError(f"Unsupported mine count: {mine_count}")
+        land_data_list = data["land_list"]
+        if not isinstance(land_data_list, list) or len(land_data_list) != field_width * field_height:
+            raise ValueError("Land list does not match the field size")
+        for land_data in land_data_list:
+            if not isinstance(land_data, dict) or not LAND_JSON_KEY_SET.issuperset(land_data):
+                raise ValueError(f"Unsupported land: {land_data}")
+            if land_data.get("cover", SYMBOL_BLANK) not in COVER_CODE_DICT \
+                    or land_data.get("adjacent_mine_count", 0) not in range(9):
+                raise ValueError(f"Unsupported land: {land_data}")
+        self.field_width, self.field_height, self.mine_count = field_width, field_height, mine_count
+        self.init_mine_field()
+        for i, land_data in enumerate(land_data_list):
+            self.land_list[i].load(land_data)
+
+
+class Game(object):
+    id = -1
+
+    terminated = False
+    start_time = None
+    end_time = None
+    result = None
+    safety_level = SAFETY_LEVEL_DEFAULT
+    edit_mode = False
+
+    mine_field = None
+
+    bot = None
+    bot_stat = None
+
+    global_stat = None
+
+    ui = None
+
+    def __init__(self, _id=0, global_stat=None):
+        self.id = _id
+        self.global_stat = global_stat
+
+        self.mine_field = self.create_mine_field()
+        self.bot = self.create_bot()
+        self.bot_stat = BotStat(self)
+
+    def create_mine_field(self):
+        return MineField(self)
+
+    def create_bot(self):
+        return Solver(self)
+
+    def new_game_setup(self, field_width=0, field_height=0, mine_count=0):
+        if field_width > 0:
+            self.mine_field.field_width = field_width
+        if field_height > 0:
+            self.mine_field.field_height = field_height
+        if mine_count > 0:
+            self.mine_field.mine_count = mine_count
+
+        self.mine_field.init_mine_field()
+
+        self.reset_status()
+
+    def reset_status(self):
+        self.terminated = False
+        self.start_time = None
+        self.end_time = None
+        self.result = None
+
+    @staticmethod
+    def default_save_folder():
+        now = datetime.datetime.now()
+        folder_name = f"screenshot/{now.strftime("%Y_%m_%d_%H")}"
+        os.makedirs(folder_name, exist_ok=True)
+        return folder_name
+
+    def default_save_name(self):
+        now = datetime.datetime.now()
+        land_count = len(self.mine_field.land_list)
+        num_len = len(str(land_count))
+        unsolved_count = land_count \
+            - self.mine_field.revealed_land_count() \
+            - self.mine_field.marked_land_count()
+        return f"{now.strftime("%Y_%m_%d_%H_%M_%S_%f")}" \
+               f"___{unsolved_count:0{num_len}}_{land_count}"
+
+    def default_save_extension(self):
+        # a screenshot needs a window, without one the file holds only the gzip compressed board
+        return "board"
+
+    def save(self, file_path, data=None):
+        self.save_image(file_path)
+        if data is None:
+            data = self.mine_field.save()
+        with open(file_path, "ab") as f:
+            f.write(gzip.compress(data))
+
+    def save_image(self, file_path):
+        # no image without a window, the board is written from the start of the file
+        open(file_path, "wb").close()
+
+    def apply_batch(self, click_land_list, mark_land_list):
+        for land in mark_land_list:
+            if self.terminated:
+                break
+            land.auto_mark()
+            self.bot_stat.record_mark()
+        for land in click_land_list:
+            if self.terminated:
+                break
+            if land.checked:
+                # revealed by a click before
+                continue
+            land.auto_click()
+            self.bot_stat.record_click()
+
+    def record_bot_result(self):
+        # returns the file the board is saved to when the bot lost the game
+        self.bot_stat.record_game_result(self.result)
+        file_path = None
+        if self.terminated and self.result == "LOSE" and self.mine_field.journal_dict is not None:
+            # board before the losing step, with the focus on the land which lost the game
+            _id = self.mine_field.focus_id
+            self.mine_field.swap_checkpoint()
+            self.mine_field.focus_id = _id
+            file_path = f"{self.default_save_folder()}/{self.default_save_name()}.{self.default_save_extension()}"
+            self.save(file_path)
+            self.mine_field.swap_checkpoint()
+        return file_path
+
+    def play(self):
+        # let the bot solve the current game, the record is sent to global_stat if there is one
+        self.bot_stat.create_record()
+        self.bot.play()
+        file_path = self.record_bot_result()
+        if self.global_stat is not None:
+            self.bot_stat.to_global_stat(file_path)
+        return self.result
+
+
+class Solver(object):
+    game = None
+
+    auto_click = False
+    auto_mark = False
+    auto_step = -1
+    random_step = 0
+    # apply every land confirmed by an analysis at once when solving continuously
+    batch_move = False
+
+    condition_list = list()
+    # global_condition = None
+    # (mask, possible_mine_min, possible_mine) of every condition
+    condition_key_set = set()
+    # conditions are kept between steps, the one of each revealed land is here by land id
+    condition_land_dict = dict()
+    # lands changed since the conditions were collected, None to collect them from scratch
+    changed_id_list = None
+    # lands around the conditions, a land is bit frontier_bit_dict[land] of a condition mask
+    frontier_land_list = list()
+    frontier_bit_dict = dict()
+    # index of the conditions holding each frontier land, by bit
+    frontier_condition_list = list()
+    random_choice_list = list()
+    iter_result_save = None
+
+    # "dict" or "numpy", the mine rates of analyse_possibility_numpy need numpy
+    possibility_engine = "dict"
+
+    debug_print = False
+
+    def __init__(self, game):
+        super().__init__()
+        self.game = game
+
+    def step(self):
+        # one synchronous solving step on the board, False if the game is over or nothing is done
+        if self.game.terminated:
+            return False
+        self.changed_id_list = self.game.mine_field.checkpoint()
+        return self.solve()
+
+    def play(self):
+        # solve the game step by step until it is over, with every move applied automatically
+        self.auto_click = True
+        self.auto_mark = True
+        self.auto_step = -1
+        self.random_step = -1
+        self.batch_move = True
+        while self.step():
+            pass
+        return self.game.result
+
+    def move_click(self, land):
+        land.auto_click()
+        self.game.bot_stat.record_click()
+
+    def move_random_click(self, land):
+        land.auto_click()
+        self.game.bot_stat.record_random_click()
+
+    def move_mark(self, land):
+        land.auto_mark()
+        self.game.bot_stat.record_mark()
+
+    def move_batch(self, click_land_list, mark_land_list):
+        self.game.apply_batch(click_land_list, mark_land_list)
+
+    # what the bot has to show, nothing to do without a window
+    def show_emote(self, emote):
+        pass
+
+    def show_message(self, message):
+        pass
+
+    def show_highlight(self, land, _type):
+        pass
+
+    def show_mine_rate(self, land, cover, color):
+        pass
+
+    def solve(self):
+        self.collect_condition(shuffle_result=True if self.auto_step == -1 else False)
+        # print("[Bot] Try to analyse ...")
+        if 1 not in self.game.mine_field.revealed_plane:
+            if self.auto_click:
+                self.show_emote(":D")
+                return self.random_click(is_first_click=True)
+            else:
+                print("[Bot] No conclusion found.")
+                self.show_emote(":(")
+                self.show_message(f"No conclusion found")
+                return False
+
+        batch_move = self.batch_move and self.auto_click and self.auto_mark and self.auto_step == -1
+        confirm_result_dict = self.analyse_condition(
+            return_instantly=True if self.auto_step == -1 and not batch_move else False,
+            return_batch=batch_move,
+        )
+        if batch_move and len(confirm_result_dict.keys()) > 0:
+            mine_field = self.game.mine_field
+            self.move_batch(
+                [mine_field.land(land_id) for land_id, have_mine in confirm_result_dict.items() if not have_mine],
+                [mine_field.land(land_id) for land_id, have_mine in confirm_result_dict.items() if have_mine],
+            )
+            self.show_emote(":D")
+            self.random_choice_list = list()
+            return True
+        if len(confirm_result_dict.keys()) > 0:
+            for land_id, have_mine in confirm_result_dict.items():
+                land = self.game.mine_field.land(land_id)
+                if not have_mine:
+                    if self.auto_click:
+                        self.move_click(land)
+                        break
+                    else:
+                        print(f"[Bot] ({land.x}, {land.y}) {land.id} is empty")
+                        self.show_message(f"({land.x + 1}, {land.y + 1}) is empty")
+                        self.show_highlight(land, "safe")
+                else:
+                    if self.auto_mark:
+                        self.move_mark(land)
+                        break
+                    else:
+                        print(f"[Bot] ({land.x}, {land.y}) {land.id} have mine")
+                        self.show_message(f"({land.x + 1}, {land.y + 1}) have mine")
+                        self.show_highlight(land, "danger")
+                self.show_emote(":D")
+                self.random_choice_list = list()
+                if self.debug_print:
+                    for cond in self.condition_list:
+                        print(cond)
+            return True
+
+        self.show_emote(":(")
+        if self.possibility_engine == "numpy" and numpy is not None:
+            possible_mine_list, possible_safe_list, possibility_dict = self.analyse_possibility_numpy()
+        else:
+            possible_mine_list, possible_safe_list, possibility_dict = self.analyse_possibility()
+        self.analyse_mark_count(possible_mine_list, possible_safe_list, possibility_dict)
+
+        if self.random_step == -1 or self.random_step > 0:
+            if self.random_step > 0:
+                self.random_step -= 1
+            return self.random_click()
+        else:
+            print("[Bot] No conclusion found.")
+            self.show_message(f"No conclusion found")
+            return False
+
+    @staticmethod
+    def generate_cond_id(cond):
+        return f"{cond["land"]}:" \
+               f"{",".join([str(x) for x in sorted(cond["adj_land"])])}_" \
+               f"{cond["possible_mine_min"]}-{cond["possible_mine"]}"
+
+    def collect_condition(self, shuffle_result=False):
+        mine_field = self.game.mine_field
+        revealed_plane = mine_field.revealed_plane
+        if self.changed_id_list is None:
+            self.condition_list = list()
+            self.condition_land_dict = dict()
+            self.frontier_land_list = list()
+            self.frontier_bit_dict = dict()
+            land_id_list = itertools.compress(range(len(revealed_plane)), revealed_plane)
+        else:
+            # only lands around a change can have a different condition
+            land_id_set = set(self.changed_id_list)
+            for land_id in self.changed_id_list:
+                land_id_set.update(mine_field.land_get_neighbor(land_id))
+            land_id_list = sorted(land_id_set)
+        self.changed_id_list = list()
+        # self.global_condition = {
+        #     "id": "",
+        #     "land": -9,
+        #     "possible_mine": mine_field.mine_count - mine_field.marked_land_count(),
+        #     "possible_mine_min": -1,
+        #     "adj_land": list(),
+        #     "derivation": "-9",
+        #     "final_cal": "",
+        # }
+        # self.global_condition["possible_mine_min"] = self.global_condition["possible_mine"]
+        new_condition_list = list()
+        stale_land_set = set()
+        for land_id in land_id_list:
+            condition = self.land_condition(land_id, shuffle_result)
+            condition_old = self.condition_land_dict.get(land_id)
+            if condition_old is not None:
+                if condition is not None and condition["key"] == condition_old["key"]:
+                    continue
+                stale_land_set.add(land_id)
+                del self.condition_land_dict[land_id]
+            if condition is not None:
+                self.condition_land_dict[land_id] = condition
+                new_condition_list.append(condition)
+
+            # if not land.checked and land.cover != SYMBOL_FLAG:
+            #     self.global_condition["adj_land"].append(land.id)
+
+        # self.condition_list.append(global_cond)
+
+        if len(stale_land_set) > 0:
+            # drop every condition derived from a changed one
+            condition_list = list()
+            stale_mask = 0
+            for cond in self.condition_list:
+                if cond["source"].isdisjoint(stale_land_set):
+                    condition_list.append(cond)
+                else:
+                    stale_mask |= cond["mask"]
+            for cond in condition_list:
+                if cond["mask"] & stale_mask:
+                    # pair it again, what it derived may have been dropped as a duplicate of a stale one
+                    cond["paired"] = False
+            self.condition_list = condition_list
+        self.condition_list.extend(new_condition_list)
+
+        if shuffle_result:
+            shuffle(self.condition_list)
+
+        self.condition_key_set = set()
+        self.frontier_condition_list = [list() for _ in range(len(self.frontier_land_list))]
+        for i, cond in enumerate(self.condition_list):
+            self.condition_key_set.add(cond["key"])
+            for bit in self.mask_bit_list(cond["mask"]):
+                self.frontier_condition_list[bit].append(i)
+
+    def land_condition(self, land_id, shuffle_result=False):
+        # condition of a revealed land, None if it tells nothing
+        mine_field = self.game.mine_field
+        revealed_plane = mine_field.revealed_plane
+        adjacent_plane = mine_field.adjacent_plane
+        cover_plane = mine_field.cover_plane
+        if not revealed_plane[land_id] or adjacent_plane[land_id] == 0:
+            return None
+        condition = {
+            "id": "",
+            "land": land_id,
+            "possible_mine": adjacent_plane[land_id],
+            "possible_mine_min": -1,
+            "adj_land": list(),
+            "mask": 0,
+            "key": None,
+            # base lands it is derived from, and whether it was paired with the other conditions
+            "source": frozenset([land_id]),
+            "paired": False,
+            "derive_op": "",
+            "derivation": f"{land_id}",
+            "final_cal": "",
+        }
+        for adj_land_id in mine_field.land_get_neighbor(land_id):
+            if not revealed_plane[adj_land_id]:
+                if cover_plane[adj_land_id] != COVER_FLAG:
+                    condition["adj_land"].append(adj_land_id)
+                    condition["mask"] |= 1 << self.frontier_bit(adj_land_id)
+                else:
+                    condition["possible_mine"] -= 1
+        if condition["possible_mine"] <= 0 and len(condition["adj_land"]) == 0:
+            return None
+
+        if shuffle_result:
+            shuffle(condition["adj_land"])
+        condition["possible_mine_min"] = condition["possible_mine"]
+        condition["key"] = (condition["mask"], condition["possible_mine_min"], condition["possible_mine"], )
+        if self.debug_print:
+            condition["id"] = self.generate_cond_id(condition)
+        return condition
+
+    def frontier_bit(self, land_id):
+        bit = self.frontier_bit_dict.get(land_id)
+        if bit is None:
+            bit = len(self.frontier_land_list)
+            self.frontier_bit_dict[land_id] = bit
+            self.frontier_land_list.append(land_id)
+        return bit
+
+    @staticmethod
+    def mask_bit_list(mask):
+        bit_list = list()
+        while mask:
+            low_bit = mask & -mask
+            bit_list.append(low_bit.bit_length() - 1)
+            mask ^= low_bit
+        return bit_list
+
+    def mask_land_list(self, mask):
+        # lands of a condition mask, sorted by id
+        return sorted([self.frontier_land_list[bit] for bit in self.mask_bit_list(mask)])
+
+    def add_condition(self, mask, possible_mine_min, possible_mine, cond_a, cond_b, derive_op):
+        # derive_op is "-" for the rest of cond_a after removing cond_b, "x" for the intersection of both
+        key = (mask, possible_mine_min, possible_mine, )
+        if key in self.condition_key_set:
+            return False
+        condition = {
+            "id": "",
+            "land": cond_a["land"],
+            "possible_mine": possible_mine,
+            "possible_mine_min": possible_mine_min,
+            "adj_land": self.mask_land_list(mask),
+            "mask": mask,
+            "key": key,
+            "source": cond_a["source"] | cond_b["source"],
+            "paired": False,
+            "derive_op": derive_op,
+            "derivation": "",
+            "final_cal": "",
+        }
+        if self.debug_print:
+            condition["derivation"] = f"({cond_a["derivation"]}) {derive_op} ({cond_b["derivation"]})"
+            condition["final_cal"] = f"{cond_a["id"]} {derive_op} {cond_b["id"]}"
+            condition["id"] = self.generate_cond_id(condition)
+        for bit in self.mask_bit_list(mask):
+            self.frontier_condition_list[bit].append(len(self.condition_list))
+        self.condition_list.append(condition)
+        self.condition_key_set.add(key)
+        return True
+
+    def random_click(self, is_first_click=False):
+        mine_field = self.game.mine_field
+        if len(self.random_choice_list) != 0:
+            land_id_list = sorted(set(self.random_choice_list))
+        else:
+            land_id_list = mine_field.clickable_land_id_list()
+        x = randint(0, len(land_id_list) - 1)
+        if is_first_click:
+            self.move_click(mine_field.land(land_id_list[x]))
+        else:
+            if self.debug_print:
+                print("[Bot] Random Click")
+            self.move_random_click(mine_field.land(land_id_list[x]))
+        return True
+
+    def iter_mine_position(self):
+        # groups of frontier lands linked by conditions, each with the number of mine layouts
+        # by the number of mines in the group, returns the groups and all frontier lands
+        if self.iter_result_save is not None:
+            return self.iter_result_save
+
+        land_condition_dict = dict()
+        for condition in self.condition_list:
+            if condition["derive_op"] == "":
+                for land in condition["adj_land"]:
+                    land_condition_dict.setdefault(land, list()).append(condition)
+        adj_land_list = sorted(land_condition_dict)
+
+        def iter_linked_land(_land):
+            for _condition in land_condition_dict[_land]:
+                yield from _condition["adj_land"]
+
+        def walk_group(_land):
+            # lands reachable from _land, in the order they are reached
+            _land_list = [_land]
+            _land_set = {_land}
+            i = 0
+            while i < len(_land_list):
+                for _adj_land in iter_linked_land(_land_list[i]):
+                    if _adj_land not in _land_set:
+                        _land_set.add(_adj_land)
+                        _land_list.append(_adj_land)
+                i += 1
+            return _land_list
+
+        mine_count_max = self.game.mine_field.cover_mine_count()
+        group_list = list()
+        checked_land_set = set()
+        for land in adj_land_list:
+            if land in checked_land_set:
+                continue
+            group_land_list = walk_group(land)
+            checked_land_set.update(group_land_list)
+            # start again from an end of the group, so only a few conditions are open at a time while counting
+            start_land = min(group_land_list, key=lambda x: (len(set(iter_linked_land(x))), x, ))
+            group_land_list = walk_group(start_land)
+
+            index_dict = {_land: i for i, _land in enumerate(group_land_list)}
+            group_condition_list = list()
+            for condition in {id(x): x for _land in group_land_list for x in land_condition_dict[_land]}.values():
+                group_condition_list.append(
+                    ([index_dict[_land] for _land in condition["adj_land"]], condition["possible_mine"], ))
+            count_list, land_count_list = self.count_mine_layout(
+                len(group_land_list), group_condition_list, mine_count_max)
+            group_list.append({
+                "land_list": group_land_list,
+                "count_list": count_list,
+                "land_count_list": land_count_list,
+            })
+
+        self.iter_result_save = group_list, adj_land_list
+        return group_list, adj_land_list
+
+    @staticmethod
+    def count_mine_layout(land_count, condition_list, mine_count_max):
+        # condition_list holds (land index list, mine count), lands are visited one by one, the state after a land
+        # is the number of mines placed in every condition still open, with the layout count by mine number.
+        # returns the layout count by mine number, and per land the count of the layouts having a mine there
+        first_list = [min(index_list) for index_list, _ in condition_list]
+        last_list = [max(index_list) for index_list, _ in condition_list]
+        # conditions of each land, with the number of their lands still to come
+        land_condition_list = [list() for _ in range(land_count)]
+        for j, (index_list, _) in enumerate(condition_list):
+            for rest, i in enumerate(sorted(index_list, reverse=True)):
+                land_condition_list[i].append((j, rest, ))
+        open_list = [
+            [j for j in range(len(condition_list)) if first_list[j] <= i < last_list[j]]
+            for i in range(land_count)
+        ]
+
+        def step(i, state, mine):
+            # state after land i - 1 to state after land i, None if a condition is broken
+            count_dict = dict(zip(open_list[i - 1], state)) if i > 0 else dict()
+            for _j, _rest in land_condition_list[i]:
+                count = count_dict.get(_j, 0) + mine
+                if count > condition_list[_j][1] or count + _rest < condition_list[_j][1]:
+                    return None
+                count_dict[_j] = count
+            return tuple([count_dict[_j] for _j in open_list[i]])
+
+        add, multiply = Solver.add_layout_count, Solver.multiply_layout_count
+        forward_list = list()
+        state_dict = {(): [1]}
+        for i in range(land_count):
+            next_state_dict = dict()
+            for state, count_list in state_dict.items():
+                for mine in (0, 1, ):
+                    next_state = step(i, state, mine)
+                    if next_state is not None:
+                        add(next_state_dict.setdefault(next_state, list()), count_list, mine, mine_count_max)
+            forward_list.append(next_state_dict)
+            state_dict = next_state_dict
+
+        # layout count of the lands after i, by the state after i
+        backward_list = [dict() for _ in range(land_count)]
+        backward_list[-1] = {(): [1]}
+        for i in range(land_count - 1, 0, -1):
+            for state in forward_list[i - 1]:
+                count_list = list()
+                for mine in (0, 1, ):
+                    next_state = step(i, state, mine)
+                    if next_state in backward_list[i]:
+                        add(count_list, backward_list[i][next_state], mine, mine_count_max)
+                if len(count_list) > 0:
+                    backward_list[i - 1][state] = count_list
+
+        land_count_list = list()
+        for i in range(land_count):
+            mine_count_list = list()
+            for state, count_list in (forward_list[i - 1] if i > 0 else {(): [1]}).items():
+                next_state = step(i, state, 1)
+                if next_state in backward_list[i]:
+                    add(mine_count_list, multiply(count_list, backward_list[i][next_state], mine_count_max), 1,
+                        mine_count_max)
+            land_count_list.append(mine_count_list)
+        return forward_list[-1].get((), list()), land_count_list
+
+    @staticmethod
+    def add_layout_count(count_list, other_list, shift, mine_count_max):
+        # count_list[k + shift] += other_list[k], up to mine_count_max mines
+        for k, count in enumerate(other_list[:max(0, mine_count_max + 1 - shift)]):
+            if k + shift < len(count_list):
+                count_list[k + shift] += count
+            else:
+                count_list.extend([0] * (k + shift - len(count_list)))
+                count_list.append(count)
+
+    @staticmethod
+    def multiply_layout_count(a_list, b_list, mine_count_max):
+        count_list = [0] * min(len(a_list) + len(b_list) - 1, mine_count_max + 1)
+        for i, a in enumerate(a_list[:len(count_list)]):
+            if a:
+                for j, b in enumerate(b_list[:len(count_list) - i]):
+                    count_list[i + j] += a * b
+        return count_list
+
+    def weigh_group_layout(self):
+        # every layout of the frontier weighs the number of ways to place the remaining mines on the other lands,
+        # returns the groups, the weight of a layout of each group by its mine number, the weight of the layouts
+        # having a mine on one of the other lands (None if there is none), and the total weight
+        group_list, adj_land_list = self.iter_mine_position()
+        cover_mine_count = self.game.mine_field.cover_mine_count()
+        none_adj_land_count = self.game.mine_field.cover_land_count() - len(adj_land_list)
+        multiply = Solver.multiply_layout_count
+
+        def comb(n, k):
+            return math.comb(n, k) if 0 <= k <= n else 0
+
+        # layout count of the groups before and after each group, by mine number
+        prefix_list = [[1]]
+        for group in group_list:
+            prefix_list.append(multiply(prefix_list[-1], group["count_list"], cover_mine_count))
+        suffix_list = [[1]]
+        for group in reversed(group_list):
+            suffix_list.append(multiply(suffix_list[-1], group["count_list"], cover_mine_count))
+        suffix_list.reverse()
+
+        total_count_list = prefix_list[-1]
+        total_weight = sum([
+            count * comb(none_adj_land_count, cover_mine_count - k) for k, count in enumerate(total_count_list)
+        ])
+        none_adj_weight = None
+        if none_adj_land_count > 0:
+            none_adj_weight = sum([
+                count * comb(none_adj_land_count - 1, cover_mine_count - k - 1)
+                for k, count in enumerate(total_count_list)
+            ])
+
+        group_weight_list = list()
+        for i, group in enumerate(group_list):
+            other_count_list = multiply(prefix_list[i], suffix_list[i + 1], cover_mine_count)
+            group_weight_list.append([
+                sum([
+                    count * comb(none_adj_land_count, cover_mine_count - k - other_k)
+                    for other_k, count in enumerate(other_count_list)
+                ])
+                for k in range(len(group["count_list"]))
+            ])
+        return group_list, group_weight_list, none_adj_weight, total_weight
+
+    def weigh_mine_layout(self):
+        # the weight of the layouts having a mine by frontier land, the same for one of the other lands,
+        # and the total weight, a mine rate is a weight divided by the total weight
+        group_list, group_weight_list, none_adj_weight, total_weight = self.weigh_group_layout()
+        land_weight_dict = dict()
+        for group, weight_list in zip(group_list, group_weight_list):
+            for land, mine_count_list in zip(group["land_list"], group["land_count_list"]):
+                land_weight_dict[land] = sum(map(operator.mul, mine_count_list, weight_list))
+        return land_weight_dict, none_adj_weight, total_weight
+
+    def iter_condition_pair(self, work_list):
+        # (a, b) with b in work_list and both sharing at least one land, each pair once,
+        # conditions added while going through the pairs wait for the next round
+        work_set = set(work_list)
+        pair_list = list()
+        for b in work_list:
+            a_set = set()
+            for bit in self.mask_bit_list(self.condition_list[b]["mask"]):
+                a_set.update(self.frontier_condition_list[bit])
+            pair_list.extend([(a, b, ) for a in sorted(a_set) if a < b or a not in work_set])
+        return pair_list
+
+    def analyse_condition(self, return_instantly=False, return_batch=False):
+        # return_instantly returns the first confirmed land,
+        # return_batch returns the lands confirmed by the first round confirming anything
+        global_condition_added = False
+        confirm_result_dict = dict()
+        # conditions not paired yet, only they can lead to something new
+        work_list = [i for i, condition in enumerate(self.condition_list) if not condition["paired"]]
+        confirm_list = range(len(self.condition_list))
+        while True:
+            for condition in [self.condition_list[i] for i in confirm_list]:
+                if condition["possible_mine"] == 0:
+                    for land in condition["adj_land"]:
+                        if land not in confirm_result_dict:
+                            confirm_result_dict[land] = False
+                            if return_instantly:
+                                return confirm_result_dict
+                        elif confirm_result_dict[land] is not False:
+                            print("conflict 01:", land)
+
+                elif condition["possible_mine"] == len(condition["adj_land"]):
+                    for land in condition["adj_land"]:
+                        if land not in confirm_result_dict:
+                            confirm_result_dict[land] = True
+                            if return_instantly:
+                                return confirm_result_dict
+                        elif confirm_result_dict[land] is not True:
+                            print("conflict 02:", land)
+            if return_batch and len(confirm_result_dict) > 0:
+                return confirm_result_dict
+
+            condition_updated = False
+            round_end = len(self.condition_list)
+            for a, b in self.iter_condition_pair(work_list):
+                if len(self.condition_list[a]["adj_land"]) >= len(self.condition_list[b]["adj_land"]):
+                    cond_a, cond_b = self.condition_list[a], self.condition_list[b]
+                else:
+                    cond_a, cond_b = self.condition_list[b], self.condition_list[a]
+                # if cond_a["land"] == cond_b["land"]:
+                #     continue
+                inter_mask = cond_a["mask"] & cond_b["mask"]
+                cond_a_new_mask = cond_a["mask"] & ~cond_b["mask"]
+                cond_b_new_mask = cond_b["mask"] & ~cond_a["mask"]
+                if cond_b_new_mask == 0:
+                    # cond_b is included in cond_a, the rest of cond_a holds the difference of mines
+                    if cond_a_new_mask != 0:
+                        possible_mine = cond_a["possible_mine"] - cond_b["possible_mine"]
+                        if self.add_condition(cond_a_new_mask, possible_mine, possible_mine, cond_a, cond_b, "-"):
+                            condition_updated = True
+                elif inter_mask != 0 and cond_a["derive_op"] != "x" and cond_b["derive_op"] != "x":
+                    inter_count = inter_mask.bit_count()
+                    min_a = max(0, cond_a["possible_mine"] - cond_a_new_mask.bit_count())
+                    min_b = max(0, cond_b["possible_mine"] - cond_b_new_mask.bit_count())
+                    max_a = min(inter_count, cond_a["possible_mine"])
+                    max_b = min(inter_count, cond_b["possible_mine"])
+                    if min(max_a, max_b) == max(min_a, min_b):
+                        possible_mine = min(max_a, max_b)
+                        if self.add_condition(inter_mask, possible_mine, possible_mine, cond_a, cond_b, "x"):
+                            condition_updated = True
+
+            # if len(confirm_result_dict) == 0 and not condition_updated and not global_condition_added:
+            #     print("condition_list len:", len(self.condition_list))
+            #
+            #     self.global_condition["id"] = self.generate_cond_id(self.global_condition)
+            #
+            #     self.condition_list.append(self.global_condition)
+            #     self.condition_id_list.append(self.global_condition["id"])
+            #
+            #     print("global_condition added")
+            #
+            #     condition_updated = True
+            #     global_condition_added = True
+            #
+            # if global_condition_added:
+            #     print("condition_list len:", len(self.condition_list))
+
+            for i in work_list:
+                self.condition_list[i]["paired"] = True
+
+            if not condition_updated:
+                break
+            work_list = confirm_list = range(round_end, len(self.condition_list))
+        # for cond in self.condition_list:
+        #     print(cond)
+        # print("condition_list len:", len(self.condition_list))
+
+        if len(confirm_result_dict.keys()) == 0:
+            mine_field = self.game.mine_field
+            land_weight_dict, none_adj_weight, total_weight = self.weigh_mine_layout()
+            if total_weight > 0:
+                for land, weight in land_weight_dict.items():
+                    if weight == 0:
+                        confirm_result_dict[land] = False
+                    elif weight == total_weight:
+                        confirm_result_dict[land] = True
+                if none_adj_weight in [0, total_weight]:
+                    # lands away from the frontier are all empty or all mines
+                    for land_id, (revealed, cover) in enumerate(zip(mine_field.revealed_plane, mine_field.cover_plane)):
+                        if not revealed and cover != COVER_FLAG and land_id not in land_weight_dict:
+                            confirm_result_dict[land_id] = none_adj_weight > 0
+
+            if len(confirm_result_dict) > 0:
+                self.iter_result_save = None
+
+        return confirm_result_dict
+
+    def analyse_possibility(self) -> (list, list, dict, ):
+        mine_field = self.game.mine_field
+        cover_land_count = self.game.mine_field.cover_land_count()
+        cover_mine_count = self.game.mine_field.cover_mine_count()
+        if cover_land_count == 0:
+            avg_mine_rate = 1.0
+        else:
+            avg_mine_rate = cover_mine_count / cover_land_count
+        max_mine_rate, min_mine_rate = avg_mine_rate, avg_mine_rate
+
+        all_adj_land_dict, none_adj_land_dict = dict(), dict()
+        for condition in self.condition_list:
+            for land in condition["adj_land"]:
+                if land not in all_adj_land_dict:
+                    all_adj_land_dict[land] = {
+                        "id": land,
+                        "mine_rate": avg_mine_rate,
+
+                        "mine_rate_v1": avg_mine_rate,
+                        "mine_rate_v1_history": [(avg_mine_rate, "None", )],
+                        "mine_rate_v2": avg_mine_rate,
+                        "mine_rate_v2_history": [(avg_mine_rate, "None", )],
+                        "mine_rate_v3": avg_mine_rate,
+                        "mine_rate_v3_history": [(avg_mine_rate, "None", )],
+                    }
+        land_weight_dict, none_adj_weight, total_weight = self.weigh_mine_layout()
+        self.iter_result_save = None
+
+        none_adj_mine_rate = avg_mine_rate
+        adj_mine_rate = avg_mine_rate
+        if total_weight > 0:
+            if none_adj_weight is not None:
+                none_adj_mine_rate = none_adj_weight / total_weight
+            if len(land_weight_dict) > 0:
+                adj_mine_rate = sum(land_weight_dict.values()) / total_weight / len(land_weight_dict)
+            # print(none_adj_mine_rate, adj_mine_rate)
+
+        for land_id, (revealed, cover) in enumerate(zip(mine_field.revealed_plane, mine_field.cover_plane)):
+            if not revealed and cover == COVER_BLANK:
+                if land_id in all_adj_land_dict:
+                    if all_adj_land_dict[land_id]["mine_rate_v3"] == avg_mine_rate:
+                        all_adj_land_dict[land_id]["mine_rate_v3"] = adj_mine_rate
+                else:
+                    none_adj_land_dict[land_id] = {
+                        "id": land_id,
+                        # "mine_rate": avg_mine_rate,
+                        "mine_rate": none_adj_mine_rate,
+                    }
+        if total_weight > 0:
+            # version_4, exact rate of the counted layouts
+            for land, weight in land_weight_dict.items():
+                all_adj_land_dict[land]["mine_rate"] = weight / total_weight
+        else:
+            for condition in self.condition_list:
+                # print(condition)
+                cond_mine_rate = condition["possible_mine"] / len(condition["adj_land"])
+                for land in condition["adj_land"]:
+                    # # version_1
+                    # if cond_mine_rate >= 0.5:
+                    #     if cond_mine_rate > all_adj_land_dict[land]["mine_rate_v1"]:
+                    #         all_adj_land_dict[land]["mine_rate_v1"] = cond_mine_rate
+                    #         all_adj_land_dict[land]["mine_rate_v1_history"].append((cond_mine_rate, condition["id"], ))
+                    # else:
+                    #     if all_adj_land_dict[land]["mine_rate_v1"] >= 0.5:
+                    #         pass
+                    #     elif abs(cond_mine_rate - avg_mine_rate) \
+                    #             > abs(all_adj_land_dict[land]["mine_rate_v1"] - avg_mine_rate):
+                    #         all_adj_land_dict[land]["mine_rate_v1"] = cond_mine_rate
+                    #         all_adj_land_dict[land]["mine_rate_v1_history"].append((cond_mine_rate, condition["id"], ))
+
+                    # # version_2
+                    # if abs(cond_mine_rate - avg_mine_rate) > abs(all_adj_land_dict[land]["mine_rate_v2"] - avg_mine_rate):
+                    #     all_adj_land_dict[land]["mine_rate_v2"] = cond_mine_rate
+                    #     all_adj_land_dict[land]["mine_rate_v2_history"].append((cond_mine_rate, condition["id"], ))
+
+                    # version_3
+                    confirm_rate = 0.7
+                    if adj_mine_rate >= confirm_rate or cond_mine_rate >= confirm_rate:
+                        if cond_mine_rate > all_adj_land_dict[land]["mine_rate_v3"]:
+                            all_adj_land_dict[land]["mine_rate_v3"] = cond_mine_rate
+                            all_adj_land_dict[land]["mine_rate_v3_history"].append((cond_mine_rate, condition["id"],))
+                    else:
+                        cond_confident = abs(cond_mine_rate - adj_mine_rate)
+                        if cond_mine_rate < adj_mine_rate:
+                            cond_confident /= adj_mine_rate
+                        else:
+                            cond_confident /= confirm_rate - adj_mine_rate
+                        record_confident = abs(all_adj_land_dict[land]["mine_rate_v3"] - adj_mine_rate)
+                        if all_adj_land_dict[land]["mine_rate_v3"] < adj_mine_rate:
+                            record_confident /= adj_mine_rate
+                        else:
+                            record_confident /= confirm_rate - adj_mine_rate
+                        if cond_confident > record_confident:
+                            all_adj_land_dict[land]["mine_rate_v3"] = cond_mine_rate
+                            all_adj_land_dict[land]["mine_rate_v3_history"].append((cond_mine_rate, condition["id"], ))
+
+                    # version selection
+                    all_adj_land_dict[land]["mine_rate"] = all_adj_land_dict[land]["mine_rate_v3"]
+
+        for _, land in itertools.chain(all_adj_land_dict.items(), none_adj_land_dict.items()):
+            # if not (land["mine_rate_v1"] == land["mine_rate_v2"] == land["mine_rate_v3"]):
+            #     print("::::", land["id"], self.game.mine_field.land(land["id"]).content == SYMBOL_MINE)
+            #     print("v1", land["mine_rate_v1"], land["mine_rate_v1_history"])
+            #     print("v2", land["mine_rate_v2"], land["mine_rate_v2_history"])
+            #     print("v3", land["mine_rate_v3"], land["mine_rate_v3_history"])
+            max_mine_rate = max(max_mine_rate, land["mine_rate"])
+            min_mine_rate = min(min_mine_rate, land["mine_rate"])
+        high_mine_rate_list, high_safe_rate_list, rate_dict = list(), list(), dict()
+        for _id, land in itertools.chain(all_adj_land_dict.items(), none_adj_land_dict.items()):
+            cover = "{:.2f}" \
+                .format(land["mine_rate"]) \
+                .replace("0.", ".") \
+                .replace("1.00", "1.0")
+            if land["mine_rate"] == max_mine_rate:
+                if self.game.ui is not None and self.game.ui.ui_activated:
+                    self.show_mine_rate(mine_field.land(_id), cover, "#e08080")
+                high_mine_rate_list.append(_id)
+                rate_dict[_id] = land["mine_rate"]
+            elif land["mine_rate"] == min_mine_rate:
+                if self.game.ui is not None and self.game.ui.ui_activated:
+                    self.show_mine_rate(mine_field.land(_id), cover, "#80e080")
+                high_safe_rate_list.append(_id)
+                rate_dict[_id] = land["mine_rate"]
+            else:
+                if self.game.ui is not None and self.game.ui.ui_activated:
+                    self.show_mine_rate(mine_field.land(_id), cover, "#909090")
+        # avg_cover = "{:.2f}" \
+        #     .format(avg_mine_rate) \
+        #     .replace("0.", ".") \
+        #     .replace("1.00", "1.0")
+        # for land in mine_field.land_list:
+        #     if land.checked or land.cover != SYMBOL_BLANK or land.id in all_adj_land_dict:
+        #         continue
+        # for _id, land in none_adj_land_dict.items():
+        #     if max_mine_rate == avg_mine_rate:
+        #         if self.game.ui is not None and self.game.ui.ui_activated:
+        #             self.result.custom_cover_ui.emit(mine_field.land(_id), avg_cover, "#e08080")
+        #         high_mine_rate_list.append(_id)
+        #         rate_dict[_id] = avg_mine_rate
+        #     elif min_mine_rate == avg_mine_rate:
+        #         if self.game.ui is not None and self.game.ui.ui_activated:
+        #             self.result.custom_cover_ui.emit(mine_field.land(_id), avg_cover, "#80e080")
+        #         high_safe_rate_list.append(_id)
+        #         rate_dict[_id] = avg_mine_rate
+        #     else:
+        #         if self.game.ui is not None and self.game.ui.ui_activated:
+        #             self.result.custom_cover_ui.emit(mine_field.land(_id), avg_cover, "#909090")
+
+        # print(f"[bot {self.game.id}] "
+        #       f"cond_list: {len(self.condition_list)}, "
+        #       f"possible_mine_list: {len(high_mine_rate_list)} ({max_mine_rate:.2f}), "
+        #       f"possible_safe_list: {len(high_safe_rate_list)} ({min_mine_rate:.2f}), "
+        #       f"avg: {avg_mine_rate:.2f}")
+        return high_mine_rate_list, high_safe_rate_list, rate_dict
+
+    def analyse_possibility_numpy(self) -> (list, list, dict, ):
+        mine_field = self.game.mine_field
+        cover_land_count = mine_field.cover_land_count()
+        if cover_land_count == 0:
+            avg_mine_rate = 1.0
+        else:
+            avg_mine_rate = mine_field.cover_mine_count() / cover_land_count
+
+        group_list, group_weight_list, none_adj_weight, total_weight = self.weigh_group_layout()
+        self.iter_result_save = None
+        if total_weight == 0:
+            # no layout fits, fall back to the heuristic rate
+            return self.analyse_possibility()
+
+        # the counts may not fit in a float, the division by the total weight is done on python ints
+        id_array_list, rate_array_list = list(), list()
+        for group, weight_list in zip(group_list, group_weight_list):
+            id_array_list.append(numpy.array(group["land_list"], dtype=numpy.int64))
+            # layout count having a mine by land and by mine number of the group, the lists are not padded
+            count_array = numpy.zeros((len(group["land_list"]), len(weight_list)), dtype=object)
+            for i, mine_count_list in enumerate(group["land_count_list"]):
+                count_array[i, :len(mine_count_list)] = mine_count_list[:len(weight_list)]
+            rate_array_list.append(
+                (count_array.dot(numpy.array(weight_list, dtype=object)) / total_weight).astype(numpy.float64))
+        cover_array = numpy.frombuffer(mine_field.cover_plane, dtype=numpy.uint8)
+        revealed_array = numpy.frombuffer(mine_field.revealed_plane, dtype=numpy.uint8)
+        none_adj_mask = (revealed_array == 0) & (cover_array == COVER_BLANK)
+        if len(id_array_list) > 0:
+            none_adj_mask[numpy.concatenate(id_array_list)] = False
+        none_adj_id_array = numpy.flatnonzero(none_adj_mask)
+        id_array_list.append(none_adj_id_array)
+        none_adj_mine_rate = none_adj_weight / total_weight if none_adj_weight is not None else avg_mine_rate
+        rate_array_list.append(numpy.full(len(none_adj_id_array), none_adj_mine_rate))
+
+        id_array = numpy.concatenate(id_array_list)
+        rate_array = numpy.concatenate(rate_array_list)
+        if len(rate_array) == 0:
+            return list(), list(), dict()
+        max_mine_rate = max(avg_mine_rate, rate_array.max())
+        min_mine_rate = min(avg_mine_rate, rate_array.min())
+        high_mine_mask = rate_array == max_mine_rate
+        high_safe_mask = ~high_mine_mask & (rate_array == min_mine_rate)
+        high_mine_rate_list = id_array[high_mine_mask].tolist()
+        high_safe_rate_list = id_array[high_safe_mask].tolist()
+        rate_dict = dict(zip(high_mine_rate_list, rate_array[high_mine_mask].tolist()))
+        rate_dict.update(zip(high_safe_rate_list, rate_array[high_safe_mask].tolist()))
+
+        if self.game.ui is not None and self.game.ui.ui_activated:
+            for _id, mine_rate, high_mine, high_safe in zip(
+                    id_array.tolist(), rate_array.tolist(), high_mine_mask.tolist(), high_safe_mask.tolist()):
+                cover = "{:.2f}" \
+                    .format(mine_rate) \
+                    .replace("0.", ".") \
+                    .replace("1.00", "1.0")
+                color = "#e08080" if high_mine else "#80e080" if high_safe else "#909090"
+                self.show_mine_rate(mine_field.land(_id), cover, color)
+        return high_mine_rate_list, high_safe_rate_list, rate_dict
+
+    def analyse_mark_count(self, possible_mine_list, possible_safe_list, possibility_dict):
+        mine_field = self.game.mine_field
+        if len(possible_safe_list) > 0:
+            choice_list = possible_safe_list
+        else:
+            choice_list = mine_field.clickable_land_id_list()
+            if len(choice_list) > len(possible_mine_list):
+                choice_list = [land_id for land_id in choice_list[:] if land_id not in possible_mine_list]
+
+        # print("choice_list", len(choice_list))
+
+        if len(choice_list) > 0 and choice_list[0] in possibility_dict and possibility_dict[choice_list[0]] > 0.3:  # >= 1/3
+            mark_count = dict()
+            min_mark_count = mine_field.mine_count
+            for land_id in choice_list:
+                mark_count[land_id] = \
+                    mine_field.row_mark_count(land_id) \
+                    + mine_field.col_mark_count(land_id) \
+                    + mine_field.range_mark_count(land_id, 2)
+                min_mark_count = min(min_mark_count, mark_count[land_id])
+
+            # print(f"[bot {self.game.id}]", "choice_list:", "[" + ", ".join([f"{x}: {mark_count[x]}" for x in choice_list]) + "]")
+
+            choice_list = [x for x in choice_list[:] if mark_count[x] == min_mark_count]
+
+            # for land_id in choice_list:
+            #     print(land_id, mark_count[land_id])
+            # print("choice_list filter by mine count", len(choice_list), choice_list)
+
+        self.random_choice_list = choice_list[:]
+
+
+class BotStat:
+    game = None
+
+    record_list = None
+    current = -1
+
+    def __init__(self, game):
+        self.game = game
+        self.record_list = list()
+
+    def create_record(self):
+        record = {
+            "no": len(self.record_list) + 1,
+            "win": None,
+            "click": 0,
+            "mark": 0,
+            "random_click": 0,
+            "start_time": datetime.datetime.now(),
+            "usage_time": 0,
+        }
+        self.record_list.append(record)
+        self.current += 1
+
+    def clear_record(self):
+        self.record_list = list()
+        self.current = -1
+
+    def record_click(self):
+        if self.current < 0:
+            self.create_record()
+        self.record_list[self.current]["click"] += 1
+
+    def record_mark(self):
+        if self.current < 0:
+            self.create_record()
+        self.record_list[self.current]["mark"] += 1
+
+    def record_random_click(self):
+        if self.current < 0:
+            self.create_record()
+        self.record_list[self.current]["random_click"] += 1
+
+    def record_game_result(self, game_result):
+        if self.current >= 0 and self.record_list[self.current]["win"] is None:
+            time_delta = datetime.datetime.now() - self.record_list[self.current]["start_time"]
+            self.record_list[self.current]["usage_time"] = float(f"{time_delta.seconds}.{time_delta.microseconds}")
+            if game_result in ["WIN", "LOSE"]:
+                self.record_list[self.current]["win"] = game_result == "WIN"
+            # print(self.record_list[self.current])
+
+    def to_global_stat(self, save_file_path=None):
+        if len(self.record_list) > 0:
+            r = self.record_list[-1].copy()
+
+            r.update({
+                "game_id": self.game.id,
+                "save_file": save_file_path,
+            })
+            self.game.global_stat.put(r)